@@ -0,0 +1,200 @@
+"""Vectorized Levenberg-Marquardt fits of every run in the ensemble at once.
+
+fit_batch() fits one model to each row of a (n_runs, n_times) array. Each
+iteration evaluates the residuals and analytic Jacobians of all rows as
+(n_runs, n_times[, n_params]) arrays and solves the n_runs damped normal
+equations in one np.linalg.solve call, with a separate damping factor per
+run. Time and rip strength (~1e-15) are rescaled to O(1) before fitting and
+the parameters and covariances are scaled back afterwards.
+"""
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class Model(ABC):
+    """A curve y = f(t, *params) with its analytic Jacobian, both vectorized over runs."""
+
+    name = None
+    params = ()
+
+    @abstractmethod
+    def f(self, t, p):
+        """(n_runs, n_times) values for params p of shape (n_runs, n_params)."""
+
+    @abstractmethod
+    def jacobian(self, t, p):
+        """(n_runs, n_times, n_params) derivatives of f with respect to each parameter."""
+
+    @abstractmethod
+    def initial(self, t, y, t_scale):
+        """Starting parameters for the data rows y, with t and y already divided by their scales."""
+
+    @abstractmethod
+    def scale(self, t_scale, y_scale):
+        """(n_runs, n_params) factors turning parameters fitted in scaled units into data units."""
+
+
+class Exponential(Model):
+    """a * exp(b * t)"""
+
+    name = "exp"
+    params = ("a", "b")
+
+    def f(self, t, p):
+        return p[:, :1] * np.exp(p[:, 1:] * t)
+
+    def jacobian(self, t, p):
+        e = np.exp(p[:, 1:] * t)
+        return np.stack([e, p[:, :1] * t * e], axis=-1)
+
+    def initial(self, t, y, t_scale):
+        # least-squares line through log(y) over the positive samples of each run
+        w = (y > 0).astype(np.float64)
+        log_y = np.log(np.where(y > 0, y, 1.0))
+        n = w.sum(axis=1)
+        st, sy = (w * t).sum(axis=1), (w * log_y).sum(axis=1)
+        stt, sty = (w * t * t).sum(axis=1), (w * t * log_y).sum(axis=1)
+        b = (n * sty - st * sy) / np.where(n * stt - st ** 2 > 0, n * stt - st ** 2, 1.0)
+        a = np.exp((sy - b * st) / np.maximum(n, 1))
+        return np.column_stack([a, b])
+
+    def scale(self, t_scale, y_scale):
+        return np.column_stack([y_scale, np.full_like(y_scale, 1.0 / t_scale)])
+
+
+class Logistic(Model):
+    """L / (1 + exp(-k * (t - t0))) + C"""
+
+    name = "logistic"
+    params = ("L", "k", "t0", "C")
+
+    def f(self, t, p):
+        L, k, t0, C = (p[:, i:i + 1] for i in range(4))
+        return L / (1 + np.exp(-k * (t - t0))) + C
+
+    def jacobian(self, t, p):
+        L, k, t0, C = (p[:, i:i + 1] for i in range(4))
+        s = 1 / (1 + np.exp(-k * (t - t0)))
+        ds = s * (1 - s)
+        return np.stack([s, L * ds * (t - t0), -L * ds * k, np.ones_like(s)], axis=-1)
+
+    def initial(self, t, y, t_scale):
+        # as plot_rip_field_fit.py: L=max(y), k=1e-3 Myr^-1, t0=steepest rise, C=min(y)
+        steepest = t[np.argmax(np.diff(y, axis=1), axis=1)]
+        return np.column_stack([y.max(axis=1), np.full(len(y), 1e-3 * t_scale), steepest, y.min(axis=1)])
+
+    def scale(self, t_scale, y_scale):
+        ones = np.ones_like(y_scale)
+        return np.column_stack([y_scale, ones / t_scale, ones * t_scale, y_scale])
+
+
+EXPONENTIAL = Exponential()
+LOGISTIC = Logistic()
+
+
+class FitResult:
+    """Per-run parameters (n_runs, n_params), covariances (n_runs, n_params, n_params) and convergence flags."""
+
+    def __init__(self, model, params, covariance, converged, ssr, iterations):
+        self.model = model
+        self.params = params
+        self.covariance = covariance
+        self.converged = converged
+        self.ssr = ssr
+        self.iterations = iterations
+
+    def __len__(self):
+        return len(self.params)
+
+    def __getitem__(self, name):
+        """Column of one parameter, e.g. result["k"]."""
+        return self.params[:, self.model.params.index(name)]
+
+    def errors(self):
+        """1-sigma parameter uncertainties."""
+        return np.sqrt(np.abs(np.diagonal(self.covariance, axis1=1, axis2=2)))
+
+    def predict(self, t):
+        return self.model.f(np.asarray(t, dtype=np.float64), self.params)
+
+
+def fit_batch(model, t, y, p0=None, max_iter=200, rtol=1e-10, lam=1e-3):
+    """Fit model to every row of y (n_runs, n_times) sampled at t; p0 is in data units.
+
+    Converges each run when its sum of squared residuals changes by less than
+    rtol (relative) on an accepted step; runs still moving after max_iter are
+    flagged converged=False.
+    """
+    t = np.asarray(t, dtype=np.float64)
+    y = np.atleast_2d(np.asarray(y, dtype=np.float64))
+    n_runs, n_times = y.shape
+
+    # work in O(1) units
+    t_scale = np.abs(t).max() or 1.0
+    y_scale = np.abs(y).max(axis=1)
+    y_scale[y_scale == 0] = 1.0
+    ts, ys = t / t_scale, y / y_scale[:, None]
+    factors = model.scale(t_scale, y_scale)
+    p = model.initial(ts, ys, t_scale) if p0 is None else np.broadcast_to(p0, factors.shape) / factors
+    p = p.astype(np.float64).copy()
+
+    residual = ys - model.f(ts, p)
+    ssr = np.einsum("ij,ij->i", residual, residual)
+    damping = np.full(n_runs, lam)
+    active = np.isfinite(ssr)
+    converged = np.zeros(n_runs, dtype=bool)
+    iterations = np.zeros(n_runs, dtype=np.int64)
+
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        idx = np.flatnonzero(active)
+        J = model.jacobian(ts, p[idx])
+        JTJ = np.einsum("rti,rtj->rij", J, J)
+        grad = np.einsum("rti,rt->ri", J, residual[idx])
+        diag = np.diagonal(JTJ, axis1=1, axis2=2)
+        A = JTJ + (damping[idx, None] * (diag + 1e-12 * diag.max(axis=1, keepdims=True)))[:, :, None] * np.eye(J.shape[-1])
+        try:
+            step = np.linalg.solve(A, grad[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            step = np.einsum("rij,rj->ri", np.linalg.pinv(A), grad)
+
+        trial = p[idx] + step
+        trial_residual = ys[idx] - model.f(ts, trial)
+        trial_ssr = np.einsum("ij,ij->i", trial_residual, trial_residual)
+        better = np.isfinite(trial_ssr) & (trial_ssr <= ssr[idx])
+
+        done = better & (ssr[idx] - trial_ssr <= rtol * np.maximum(ssr[idx], np.finfo(float).tiny))
+        accept = idx[better]
+        p[accept], residual[accept], ssr[accept] = trial[better], trial_residual[better], trial_ssr[better]
+        damping[idx] = np.where(better, damping[idx] / 10, damping[idx] * 10)
+        iterations[idx] += 1
+
+        # a run whose damping explodes can't improve any more: it sits at a minimum
+        stuck = ~better & (damping[idx] > 1e16)
+        converged[idx[done | stuck]] = True
+        active[idx[done | stuck]] = False
+
+    # covariance as scipy.optimize.curve_fit (absolute_sigma=False), in scaled units
+    J = model.jacobian(ts, p)
+    JTJ = np.einsum("rti,rtj->rij", J, J)
+    dof = max(n_times - p.shape[1], 1)
+    covariance = np.linalg.pinv(JTJ) * (ssr / dof)[:, None, None]
+
+    converged &= np.all(np.isfinite(p), axis=1)
+    return FitResult(model, p * factors, covariance * factors[:, :, None] * factors[:, None, :],
+                     converged, ssr * y_scale ** 2, iterations)
+
+
+def parameter_summary(result, percentiles=(2.5, 16, 50, 84, 97.5)):
+    """Distribution of each parameter over the converged runs, as a JSON-ready dict."""
+    ok = result.converged
+    summary = {"n_runs": int(len(result)), "converged": int(ok.sum())}
+    for name in result.model.params:
+        values = result[name][ok]
+        if not len(values):
+            continue
+        summary[name] = {"mean": float(values.mean()), "std": float(values.std()),
+                         **{f"p{q:g}": float(v) for q, v in zip(percentiles, np.percentile(values, percentiles))}}
+    return summary
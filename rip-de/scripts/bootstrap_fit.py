@@ -0,0 +1,62 @@
+"""Bootstrap uncertainties for fits of the ensemble-mean rip field.
+
+Every bootstrap replicate resamples the runs with replacement; its mean curve
+is one row of (resample counts @ ensemble) / n_runs, so a whole block of
+replicates is a single matrix product. Blocks are fitted with
+batch_fit.fit_batch, warm-started from the fit of the full ensemble mean, and
+spread over a process pool. The resampling is drawn up front from one seed,
+so the intervals do not depend on the number of workers.
+"""
+import os
+from multiprocessing import Pool
+
+import numpy as np
+from batch_fit import fit_batch, FitResult
+
+N_BOOTSTRAP = 2000
+BLOCK = 250
+PERCENTILES = (2.5, 16, 50, 84, 97.5)
+
+
+def _fit_block(task):
+    model, t, y, counts, p0 = task
+    means = counts @ y / y.shape[0]
+    result = fit_batch(model, t, means, p0=p0)
+    return result.params, result.converged
+
+
+def bootstrap_fit(model, t, y, n_bootstrap=N_BOOTSTRAP, seed=0, p0=None, workers=None, block=BLOCK):
+    """Fit model to n_bootstrap resampled ensemble means of y (n_runs, n_times); returns (point fit, replicates)."""
+    t = np.asarray(t, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    point = fit_batch(model, t, y.mean(axis=0), p0=p0)
+
+    rng = np.random.default_rng(seed)
+    n_runs = len(y)
+    counts = np.stack([np.bincount(rng.integers(n_runs, size=n_runs), minlength=n_runs)
+                       for _ in range(n_bootstrap)]).astype(np.float64)
+    tasks = [(model, t, y, counts[start:start + block], point.params[0])
+             for start in range(0, n_bootstrap, block)]
+
+    workers = min(workers or int(os.environ.get("RIP_WORKERS", 0)) or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        results = [_fit_block(task) for task in tasks]
+    else:
+        with Pool(workers) as pool:
+            results = pool.map(_fit_block, tasks)
+
+    params = np.concatenate([p for p, _ in results])
+    converged = np.concatenate([c for _, c in results])
+    replicates = FitResult(model, params, np.full(params.shape + params.shape[-1:], np.nan),
+                           converged, np.full(len(params), np.nan), np.zeros(len(params), dtype=np.int64))
+    return point, replicates
+
+
+def bootstrap_intervals(replicates, percentiles=PERCENTILES):
+    """Percentiles of each parameter over the converged replicates, as a JSON-ready dict."""
+    ok = replicates.converged
+    intervals = {"n": int(len(replicates)), "converged": int(ok.sum())}
+    for name in replicates.model.params:
+        values = np.percentile(replicates[name][ok], percentiles) if ok.any() else [np.nan] * len(percentiles)
+        intervals[name] = {f"p{q:g}": float(v) for q, v in zip(percentiles, values)}
+    return intervals
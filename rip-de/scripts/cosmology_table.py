@@ -0,0 +1,109 @@
+"""Cached age(z) lookup tables for converting simulation time to redshift.
+
+A table holds the cosmic age at n redshifts spaced uniformly in ln(1+z). The
+ages come from one vectorized pass over astropy's inv_efunc (5-point
+Gauss-Legendre per grid interval, summed down from z_max) instead of one
+cosmo.age() integral per redshift. Tables are saved to disk keyed by the
+cosmology's parameters, the redshift range and n, so later runs only load
+them. age_table(accuracy=...) doubles n until the table's inverse lookup
+z(age) is within that absolute redshift error, checked at every interval
+midpoint.
+"""
+import hashlib
+import os
+
+import numpy as np
+from astropy.cosmology import Planck18
+
+TABLE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../data/cosmology_tables")
+
+_GL_NODES, _GL_WEIGHTS = np.polynomial.legendre.leggauss(5)
+
+
+class AgeTable:
+    """Cosmic age (Gyr) against redshift, with forward and inverse linear interpolation in ln(1+z)."""
+
+    def __init__(self, z, age_gyr, max_error, cosmology):
+        self.z = z
+        self.age_gyr = age_gyr
+        self.max_error = float(max_error)
+        self.cosmology = str(cosmology)
+        self._x = np.log1p(z)
+
+    def __len__(self):
+        return len(self.z)
+
+    def age(self, z):
+        """Age in Gyr at redshift z (clamped to the table's range)."""
+        return np.interp(np.log1p(z), self._x, self.age_gyr)
+
+    def redshift(self, age_gyr):
+        """Redshift at which the universe had the given age (clamped to the table's range)."""
+        # ages decrease with z, np.interp needs increasing x
+        return np.expm1(np.interp(age_gyr, self.age_gyr[::-1], self._x[::-1]))
+
+
+def _interval_integrals(cosmo, x):
+    """t_H * integral of inv_efunc over each [x[i], x[i + 1]] of an ln(1+z) grid, in Gyr."""
+    half = np.diff(x)[:, None] / 2
+    nodes = (x[:-1, None] + x[1:, None]) / 2 + half * _GL_NODES
+    integrand = cosmo.inv_efunc(np.expm1(nodes))
+    return cosmo.hubble_time.to("Gyr").value * (integrand * _GL_WEIGHTS).sum(axis=1) * half[:, 0]
+
+
+def _ages(cosmo, x, age_at_end):
+    """Ages at every grid point, integrating down from the last one (whose age is given)."""
+    steps = _interval_integrals(cosmo, x)
+    return age_at_end + np.concatenate([np.cumsum(steps[::-1])[::-1], [0.0]])
+
+
+def build_age_table(cosmo, z_min, z_max, n):
+    """Compute an n-point table and the worst z error of its inverse lookup at interval midpoints."""
+    x = np.linspace(np.log1p(z_min), np.log1p(z_max), n)
+    age_end = cosmo.age(z_max).to("Gyr").value
+    ages = _ages(cosmo, x, age_end)
+
+    x_mid = (x[:-1] + x[1:]) / 2
+    age_mid = ages[1:] + _interval_integrals(cosmo, np.stack([x_mid, x[1:]], axis=1).ravel())[::2]
+    table = AgeTable(np.expm1(x), ages, 0.0, repr(cosmo))
+    table.max_error = np.abs(table.redshift(age_mid) - np.expm1(x_mid)).max()
+    return table
+
+
+def _cache_file(cache_dir, cosmo, z_min, z_max, n):
+    key = f"{TABLE_VERSION}|{cosmo!r}|{z_min!r}|{z_max!r}|{n}"
+    digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+    return os.path.join(cache_dir, f"age_{cosmo.name or 'cosmology'}_{n}_{digest}.npz")
+
+
+def load_or_build(cosmo, z_min, z_max, n, cache_dir=DEFAULT_CACHE_DIR):
+    """The n-point table for cosmo over [z_min, z_max], from cache_dir if it was built before."""
+    path = _cache_file(cache_dir, cosmo, z_min, z_max, n)
+    if os.path.exists(path):
+        with np.load(path) as f:
+            return AgeTable(f["z"], f["age_gyr"], f["max_error"], f["cosmology"])
+
+    table = build_age_table(cosmo, z_min, z_max, n)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, z=table.z, age_gyr=table.age_gyr, max_error=table.max_error, cosmology=table.cosmology)
+    os.replace(tmp, path)
+    return table
+
+
+def age_table(cosmo=Planck18, z_min=0.01, z_max=10.0, n=None, accuracy=1e-6, cache_dir=DEFAULT_CACHE_DIR):
+    """Age table with n points, or (n=None) the smallest power-of-two grid whose inverse z error <= accuracy."""
+    if n is not None:
+        return load_or_build(cosmo, z_min, z_max, n, cache_dir)
+    n = 256
+    while True:
+        table = load_or_build(cosmo, z_min, z_max, n, cache_dir)
+        if table.max_error <= accuracy or n >= 1 << 22:
+            return table
+        n *= 2
+
+
+def time_to_redshift(time_myr, cosmo=Planck18, accuracy=1e-6):
+    """Map simulation time (Myr since the big bang) to redshift using the cosmology's age(z)."""
+    return age_table(cosmo, accuracy=accuracy).redshift(np.asarray(time_myr) / 1_000.0)
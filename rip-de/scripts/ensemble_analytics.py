@@ -0,0 +1,76 @@
+"""Lazily computed, memoized series derived from the rip-de ensemble.
+
+EnsembleAnalytics computes each derived quantity (time derivatives, their
+per-time statistics, the ΛCDM normalisation and the min/max envelope) the
+first time a plot asks for it and keeps it, so every plot fed the same
+RipRuns (see RipRuns.analytics and plot_all.py) shares one computation.
+Derivatives use the actual time_myr axis, so they are per Myr (per Myr²).
+"""
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+from ensemble_stats import ensemble_stats, WelfordStats, CHUNK_RUNS
+
+# ΛCDM dark energy density (kg/m³) the ensemble-mean peak is scaled to
+LCDM_DENSITY = 7e-27
+
+
+class EnsembleAnalytics:
+    """Derived series of a (n_runs, n_times) rip ensemble on its time axis, computed on first use."""
+
+    def __init__(self, time, rip, labels=None, chunk_runs=CHUNK_RUNS):
+        self.time = np.asarray(time)
+        self.rip = rip
+        self.labels = labels
+        self.chunk_runs = chunk_runs
+        self._t = self.time.astype(np.float64)
+
+    @cached_property
+    def stats(self):
+        """EnsembleStats of rip_strength (and its first derivative), streamed over the runs."""
+        return ensemble_stats(self, chunk_runs=self.chunk_runs)
+
+    @cached_property
+    def derivative(self):
+        """d(rip)/dt of every run, (n_runs, n_times)."""
+        return np.gradient(self.rip, self._t, axis=1)
+
+    @cached_property
+    def second_derivative(self):
+        """d²(rip)/dt² of every run, (n_runs, n_times)."""
+        return np.gradient(self.derivative, self._t, axis=1)
+
+    @property
+    def derivative_stats(self):
+        return self.stats.derivative
+
+    @cached_property
+    def second_derivative_stats(self):
+        """WelfordStats of d²(rip)/dt², streamed in blocks (reuses second_derivative if already computed)."""
+        stats = WelfordStats(len(self.time))
+        if "second_derivative" in self.__dict__:
+            return stats.update(self.second_derivative)
+        for start in range(0, len(self.rip), self.chunk_runs):
+            block = np.gradient(self.rip[start:start + self.chunk_runs], self._t, axis=1)
+            stats.update(np.gradient(block, self._t, axis=1))
+        return stats
+
+    @cached_property
+    def lcdm_scale(self):
+        """Factor mapping rip strength to kg/m³ so the peak of the ensemble mean equals LCDM_DENSITY."""
+        return LCDM_DENSITY / self.stats.rip.mean.max()
+
+    @cached_property
+    def envelope(self):
+        """(min, max) over runs at each time."""
+        return self.stats.rip.min, self.stats.rip.max
+
+    def normalized_frame(self):
+        """Runs, average, min and max scaled to ΛCDM as a DataFrame indexed by time_myr."""
+        frame = pd.DataFrame(np.asarray(self.rip).T * self.lcdm_scale,
+                             index=pd.Index(self.time, name="time_myr"), columns=self.labels)
+        frame["average"] = self.stats.rip.mean * self.lcdm_scale
+        frame["min"] = self.envelope[0] * self.lcdm_scale
+        frame["max"] = self.envelope[1] * self.lcdm_scale
+        return frame
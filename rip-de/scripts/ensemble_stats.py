@@ -0,0 +1,156 @@
+"""One-pass per-time statistics over an arbitrarily large rip-de ensemble.
+
+Runs are streamed through the accumulators a block at a time, so memory is
+O(n_times) (plus one block) whatever the number of runs:
+
+* WelfordStats - count, mean, variance, min and max, merged block by block
+  with the parallel form of Welford's update (Chan et al.).
+* P2Quantiles - P² quantile sketches (Jain & Chlamtac), five markers per
+  quantile per time, updated for all times at once.
+* EnsembleStats - both of the above for rip_strength plus WelfordStats of
+  its time derivative, and the rip_field_mean_std.csv writer.
+"""
+import numpy as np
+import pandas as pd
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+CHUNK_RUNS = 1024
+
+
+class WelfordStats:
+    """Running mean/variance/min/max of (n_times,) observations."""
+
+    def __init__(self, n_times):
+        self.count = 0
+        self.mean = np.zeros(n_times)
+        self._m2 = np.zeros(n_times)
+        self.min = np.full(n_times, np.inf)
+        self.max = np.full(n_times, -np.inf)
+
+    def update(self, block):
+        """Add a (k, n_times) block of runs (or a single (n_times,) run)."""
+        block = np.atleast_2d(np.asarray(block, dtype=np.float64))
+        k = len(block)
+        if not k:
+            return self
+        block_mean = block.mean(axis=0)
+        block_m2 = ((block - block_mean) ** 2).sum(axis=0)
+
+        total = self.count + k
+        delta = block_mean - self.mean
+        self.mean += delta * (k / total)
+        self._m2 += block_m2 + delta ** 2 * (self.count * k / total)
+        self.count = total
+        np.minimum(self.min, block.min(axis=0), out=self.min)
+        np.maximum(self.max, block.max(axis=0), out=self.max)
+        return self
+
+    def variance(self, ddof=0):
+        return self._m2 / max(self.count - ddof, 1)
+
+    def std(self, ddof=0):
+        """Standard deviation; ddof=0 matches np.std."""
+        return np.sqrt(self.variance(ddof))
+
+
+class P2Quantiles:
+    """P² estimates of several quantiles of (n_times,) observations, without storing them."""
+
+    def __init__(self, n_times, quantiles=QUANTILES):
+        self.quantiles = np.asarray(quantiles, dtype=np.float64)
+        self.count = 0
+        self._first = []
+        shape = (5, len(self.quantiles), n_times)
+        p = self.quantiles[:, None]
+        self._q = np.zeros(shape)                           # marker heights
+        self._n = np.zeros(shape)                           # marker positions (1-based)
+        self._desired = np.stack([np.ones_like(p), 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5 + 0 * p])
+        self._step = np.stack([0 * p, p / 2, p, (1 + p) / 2, np.ones_like(p)])
+
+    def update(self, block):
+        """Add a (k, n_times) block of runs (or a single (n_times,) run)."""
+        for x in np.atleast_2d(np.asarray(block, dtype=np.float64)):
+            self._add(x)
+        return self
+
+    def _add(self, x):
+        self.count += 1
+        if self.count <= 5:
+            self._first.append(x)
+            if self.count == 5:
+                self._q[:] = np.sort(self._first, axis=0)[:, None, :]
+                self._n[:] = np.arange(1, 6)[:, None, None]
+                self._first = []
+            return
+
+        q, n = self._q, self._n
+        np.minimum(q[0], x, out=q[0])
+        np.maximum(q[4], x, out=q[4])
+        cell = (q[1:4] <= x).sum(axis=0)                    # x lies between markers cell and cell + 1
+        n += np.arange(5)[:, None, None] > cell
+        self._desired += self._step
+
+        for i in (1, 2, 3):
+            d = self._desired[i] - n[i]
+            move = ((d >= 1) & (n[i + 1] - n[i] > 1)) | ((d <= -1) & (n[i - 1] - n[i] < -1))
+            if not move.any():
+                continue
+            s = np.sign(d)
+            parabolic = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+            q_side = np.where(s > 0, q[i + 1], q[i - 1])
+            n_side = np.where(s > 0, n[i + 1], n[i - 1])
+            linear = q[i] + s * (q_side - q[i]) / (n_side - n[i])
+            height = np.where((q[i - 1] < parabolic) & (parabolic < q[i + 1]), parabolic, linear)
+            q[i] = np.where(move, height, q[i])
+            n[i] = np.where(move, n[i] + s, n[i])
+
+    def result(self):
+        """(n_quantiles, n_times) estimates; exact while fewer than 5 runs were seen."""
+        if self.count < 5:
+            return np.quantile(np.asarray(self._first), self.quantiles, axis=0)
+        return self._q[2].copy()
+
+
+class EnsembleStats:
+    """Per-time statistics of rip_strength and of d(rip_strength)/dt, fed run blocks in one pass."""
+
+    def __init__(self, time, quantiles=QUANTILES):
+        self.time = np.asarray(time)
+        self.rip = WelfordStats(len(self.time))
+        self.quantiles = P2Quantiles(len(self.time), quantiles)
+        self.derivative = WelfordStats(len(self.time))
+
+    @property
+    def count(self):
+        return self.rip.count
+
+    def update(self, block):
+        block = np.atleast_2d(np.asarray(block, dtype=np.float64))
+        self.rip.update(block)
+        self.quantiles.update(block)
+        self.derivative.update(np.gradient(block, self.time.astype(np.float64), axis=1))
+        return self
+
+    def quantile_frame(self):
+        """Quantile estimates as a DataFrame indexed by time_myr, one column per quantile."""
+        columns = [f"q{q:g}" for q in self.quantiles.quantiles]
+        return pd.DataFrame(self.quantiles.result().T, index=pd.Index(self.time, name="time_myr"),
+                            columns=columns)
+
+    def to_csv(self, csv_path):
+        """Write time_myr, rip_mean, rip_std (population std) as in rip_field_mean_std.csv."""
+        pd.DataFrame({
+            "time_myr": self.time,
+            "rip_mean": self.rip.mean,
+            "rip_std": self.rip.std(),
+        }).to_csv(csv_path, index=False)
+
+
+def ensemble_stats(runs, quantiles=QUANTILES, chunk_runs=CHUNK_RUNS):
+    """Stream a RipRuns (or any object with .time and a (n_runs, n_times) .rip) through EnsembleStats."""
+    stats = EnsembleStats(runs.time, quantiles)
+    for start in range(0, len(runs.rip), chunk_runs):
+        stats.update(runs.rip[start:start + chunk_runs])
+    return stats
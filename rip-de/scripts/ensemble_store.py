@@ -0,0 +1,151 @@
+"""Memory-mapped store of the whole rip-de run ensemble.
+
+All runs are packed into one raw float64 file of shape (1 + n_runs, n_times):
+row 0 is the shared time_myr axis and every following row is one run's
+rip_strength. A JSON sidecar lists the runs and the size/mtime of the CSV each
+came from. Opening the store is a single np.memmap however many runs there
+are; sync_runs() appends the run_*.csv files rip-de has written since the last
+sync and rebuilds the store only if an already stored CSV changed.
+"""
+import glob
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+STORE_VERSION = 1
+DTYPE = "<f8"
+
+
+def default_store_path(data_path):
+    return os.path.join(data_path, "run_ensemble.f64")
+
+
+def _meta_path(path):
+    return path + ".json"
+
+
+def _read_meta(path):
+    try:
+        with open(_meta_path(path)) as f:
+            meta = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    expected = (1 + len(meta.get("runs", ()))) * meta.get("n_times", 0) * np.dtype(DTYPE).itemsize
+    if meta.get("version") != STORE_VERSION or not os.path.exists(path) or os.path.getsize(path) != expected:
+        return None
+    return meta
+
+
+def _write_meta(path, meta):
+    tmp = _meta_path(path) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=1)
+    os.replace(tmp, _meta_path(path))
+
+
+def _source_signature(csv_path):
+    st = os.stat(csv_path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+class EnsembleStore:
+    """rip_strength of every run (rows of .rip) against the shared .time axis, memory-mapped."""
+
+    def __init__(self, path, meta):
+        self.path = path
+        self.meta = meta
+        self._map()
+
+    def _map(self):
+        shape = (1 + len(self.meta["runs"]), self.meta["n_times"])
+        self._data = np.memmap(self.path, dtype=DTYPE, mode="r", shape=shape)
+        # time_myr keeps the dtype it had in the CSVs (rip-de writes whole Myr)
+        self.time = np.asarray(self._data[0]).astype(self.meta["time_dtype"])
+        self.rip = self._data[1:]
+
+    @property
+    def runs(self):
+        """Source file name of every stored run, in row order."""
+        return list(self.meta["runs"])
+
+    def __len__(self):
+        return len(self.meta["runs"])
+
+    def append(self, runs, rip, sources=None):
+        """Append rows of rip (n_new, n_times) named by runs; rows go to the end of the file."""
+        rip = np.atleast_2d(np.asarray(rip, dtype=DTYPE))
+        if rip.shape != (len(runs), self.meta["n_times"]):
+            raise ValueError(f"expected {len(runs)} runs of {self.meta['n_times']} times, got {rip.shape}")
+        duplicate = set(runs) & set(self.meta["runs"])
+        if duplicate:
+            raise ValueError(f"runs already stored: {', '.join(sorted(duplicate))}")
+
+        self._data = self.rip = None  # release the mapping before the file grows
+        with open(self.path, "ab") as f:
+            f.write(rip.tobytes())
+        self.meta["runs"] += list(runs)
+        self.meta["sources"].update(sources or {})
+        _write_meta(self.path, self.meta)
+        self._map()
+        return self
+
+
+def create_store(path, time, runs=(), rip=None, sources=None):
+    """Write a new store holding the time axis and the given runs, replacing any existing one."""
+    time = np.asarray(time)
+    meta = {"version": STORE_VERSION, "n_times": len(time), "time_dtype": time.dtype.str,
+            "runs": [], "sources": {}}
+    with open(path, "wb") as f:
+        f.write(time.astype(DTYPE).tobytes())
+    _write_meta(path, meta)
+    store = EnsembleStore(path, meta)
+    if len(runs):
+        store.append(runs, rip, sources)
+    return store
+
+
+def open_store(path):
+    """Open an existing store, or return None if it is missing or incomplete."""
+    meta = _read_meta(path)
+    return None if meta is None else EnsembleStore(path, meta)
+
+
+def _read_runs(files, time=None):
+    """Parse run CSVs into (time, rip) and check they share one time axis."""
+    frames = [pd.read_csv(f, usecols=["time_myr", "rip_strength"]) for f in files]
+    time = frames[0]["time_myr"].to_numpy() if time is None else time
+    for file, df in zip(files, frames):
+        if not np.array_equal(df["time_myr"].to_numpy(), time):
+            raise ValueError(f"{file} does not share the ensemble time axis")
+    return time, np.stack([df["rip_strength"].to_numpy(np.float64) for df in frames])
+
+
+def sync_runs(data_path="../data", pattern="run_*.csv", path=None):
+    """Bring the store up to date with the run CSVs in data_path and return it."""
+    path = path or default_store_path(data_path)
+    files = sorted(glob.glob(os.path.join(data_path, pattern)))
+    if not files:
+        raise FileNotFoundError(f"No {pattern} files found in {data_path}")
+    signatures = {os.path.basename(f): _source_signature(f) for f in files}
+
+    store = open_store(path)
+    if store is not None and any(signatures.get(name) != sig for name, sig in store.meta["sources"].items()):
+        store = None  # a stored run was rewritten or removed
+    if store is None:
+        time, rip = _read_runs(files)
+        names = [os.path.basename(f) for f in files]
+        return create_store(path, time, names, rip, {name: signatures[name] for name in names})
+
+    new = [f for f in files if os.path.basename(f) not in store.meta["sources"]]
+    if new:
+        _, rip = _read_runs(new, store.time)
+        names = [os.path.basename(f) for f in new]
+        store.append(names, rip, {name: signatures[name] for name in names})
+    return store
+
+
+if __name__ == "__main__":
+    store = sync_runs("../data")
+    print(f"{store.path}: {len(store)} runs x {len(store.time)} times")
@@ -0,0 +1,153 @@
+"""Chi² grid search of the rip-field H(z) model against cosmic-chronometer data.
+
+The model is the one plotted by compare_rip_field_to_hz.py:
+
+    H(z) = H0 * sqrt(Ω_m (1+z)^3 + Ω_r (1+z)^4 + Ω_rip,0 * r(z) * (1+z)^-w)
+
+where r(z) is the ensemble-mean rip field normalised to 1 today. grid_search()
+evaluates it for every point of an N-D grid over (w, omega_rip_0, H0,
+omega_m) as one broadcast (points x redshifts) computation per chunk of grid
+points, so memory stays bounded however large the grid is.
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+from astropy.cosmology import Planck18 as cosmo
+from rip_runs import load_runs
+from cosmology_table import time_to_redshift
+
+OMEGA_R = 9.24e-5                       # radiation density today
+PARAMETERS = ("w", "omega_rip_0", "H0", "omega_m")
+CHUNK_ELEMENTS = 1 << 20                # grid points x redshifts evaluated per chunk
+
+# observational H(z) data (cosmic chronometers sample)
+CHRONOMETERS = pd.DataFrame({
+    "z":  [0.07,0.10,0.12,0.17,0.179,0.199,0.20,0.27,0.28,0.352,
+           0.40,0.44,0.48,0.593,0.60,0.68,0.73,0.781,0.875,0.88,
+           0.90,1.037,1.30,1.43,1.53,1.75,1.965,2.34,2.36],
+    "H":  [69.0,69.0,68.6,83.0,75.0,75.0,72.9,77.0,88.8,83.0,
+           95.0,82.6,97.0,104.0,87.9,92.0,97.3,105.0,125.0,90.0,
+           117.0,154.0,168.0,177.0,140.0,202.0,186.5,222.0,226.0],
+    "err":[19.6,12.0,26.2,8.0, 4.0, 5.0,29.6,14.0,36.6,14.0,
+           17.0, 7.8,62.0,13.0, 5.4, 8.0, 7.0,12.0, 17.0,40.0,
+           23.0,20.0,13.0,18.0,14.0,40.0,50.4, 7.0, 9.3]
+})
+
+# the grid of rip_Hz_chi2_surface.csv
+DEFAULT_GRID = {
+    "w": np.arange(0.5, 1.0 + 1e-9, 0.05),
+    "omega_rip_0": np.arange(0.6, 0.78 + 1e-9, 0.005),
+}
+
+
+class RipHzModel:
+    """H(z) of the rip-field cosmology for a given ensemble-mean rip field."""
+
+    def __init__(self, time_myr, rip_mean, H0=cosmo.H0.value, omega_m=cosmo.Om0, omega_r=OMEGA_R):
+        self.z_sim = time_to_redshift(time_myr)
+        # rip field relative to today (lowest simulated redshift)
+        self.profile_sim = rip_mean / rip_mean[np.argmin(self.z_sim)]
+        order = np.argsort(self.z_sim)
+        self._z_sorted, self._profile_sorted = self.z_sim[order], self.profile_sim[order]
+        self.defaults = {"H0": H0, "omega_m": omega_m}
+        self.omega_r = omega_r
+
+    @classmethod
+    def from_runs(cls, runs, **kwargs):
+        return cls(runs.time, runs.mean(), **kwargs)
+
+    def profile(self, z):
+        """r(z), interpolated between the simulated redshifts."""
+        return np.interp(z, self._z_sorted, self._profile_sorted)
+
+    def H(self, w, omega_rip_0, H0=None, omega_m=None, z=None):
+        """H(z) in km/s/Mpc; parameters broadcast against z (default: the simulation's own redshifts)."""
+        if z is None:
+            z, profile = self.z_sim, self.profile_sim
+        else:
+            z = np.asarray(z, dtype=np.float64)
+            profile = self.profile(z)
+        H0 = self.defaults["H0"] if H0 is None else H0
+        omega_m = self.defaults["omega_m"] if omega_m is None else omega_m
+        log1pz = np.log1p(z)
+        omega_rip = omega_rip_0 * profile * np.exp(-w * log1pz)
+        return H0 * np.sqrt(omega_m * np.exp(3 * log1pz) + self.omega_r * np.exp(4 * log1pz) + omega_rip)
+
+    def chi2(self, data=CHRONOMETERS, **params):
+        """Chi² against data for parameter arrays of any (common) shape."""
+        params = {name: np.asarray(value, dtype=np.float64)[..., None] for name, value in params.items()}
+        z, H, err = (data[c].to_numpy(np.float64) for c in ("z", "H", "err"))
+        residual = (self.H(z=z, **params) - H) / err
+        return np.einsum("...i,...i->...", residual, residual)
+
+
+def grid_search(model, grid, data=CHRONOMETERS, chunk_elements=CHUNK_ELEMENTS):
+    """Chi² over the outer product of grid (name -> 1D values), shaped like the grid."""
+    names = list(grid)
+    unknown = set(names) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"unknown parameters {sorted(unknown)}; expected some of {PARAMETERS}")
+    axes = [np.asarray(grid[name], dtype=np.float64) for name in names]
+    shape = tuple(len(axis) for axis in axes)
+    chi2 = np.empty(int(np.prod(shape)))
+
+    chunk = max(1, chunk_elements // len(data))
+    for start in range(0, len(chi2), chunk):
+        index = np.unravel_index(np.arange(start, min(start + chunk, len(chi2))), shape)
+        params = {name: axis[i] for name, axis, i in zip(names, axes, index)}
+        chi2[start:start + chunk] = model.chi2(data, **params)
+    return chi2.reshape(shape)
+
+
+def best_fit(grid, chi2):
+    """Dict of the grid point with the lowest chi², plus chi2."""
+    index = np.unravel_index(np.argmin(chi2), chi2.shape)
+    best = {name: values[i] for (name, values), i in zip(grid.items(), index)}
+    best["chi2"] = chi2[index]
+    return best
+
+
+def write_results(grid, chi2, data_path="../data"):
+    """Write rip_gridsearch_chi2.csv (long), rip_Hz_chi2_surface.csv (w x omega_rip_0) and rip_Hz_bestfit.csv."""
+    names = list(grid)
+    mesh = np.meshgrid(*[grid[name] for name in names], indexing="ij")
+    table = pd.DataFrame({name: m.ravel() for name, m in zip(names, mesh)})
+    table["chi2"] = chi2.ravel()
+    table.to_csv(os.path.join(data_path, "rip_gridsearch_chi2.csv"), index=False)
+
+    # surface over (w, omega_rip_0), minimised over any other grid axes
+    other = tuple(i for i, name in enumerate(names) if name not in ("w", "omega_rip_0"))
+    surface = chi2.min(axis=other) if other else chi2
+    if names.index("w") > names.index("omega_rip_0"):
+        surface = surface.T
+    pd.DataFrame(surface, index=pd.Index(grid["w"], name="w"), columns=grid["omega_rip_0"]) \
+        .to_csv(os.path.join(data_path, "rip_Hz_chi2_surface.csv"))
+
+    pd.DataFrame([best_fit(grid, chi2)]).to_csv(os.path.join(data_path, "rip_Hz_bestfit.csv"), index=False)
+
+
+def _axis(values):
+    start, stop, step = values
+    return np.arange(start, stop + step * 1e-6, step)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chi² grid search of the rip-field H(z) model.")
+    for name in PARAMETERS:
+        parser.add_argument(f"--{name}", nargs=3, type=float, metavar=("START", "STOP", "STEP"),
+                            help=f"grid for {name} (default: {'surface grid' if name in DEFAULT_GRID else 'Planck18, fixed'})")
+    args = parser.parse_args()
+
+    grid = dict(DEFAULT_GRID)
+    for name in PARAMETERS:
+        if getattr(args, name) is not None:
+            grid[name] = _axis(getattr(args, name))
+
+    model = RipHzModel.from_runs(load_runs("../data"))
+    chi2 = grid_search(model, grid)
+    write_results(grid, chi2, "../data")
+
+    best = best_fit(grid, chi2)
+    print(f"Evaluated {chi2.size} models; best fit: " + ", ".join(f"{k}={v:.4g}" for k, v in best.items()))
@@ -0,0 +1,170 @@
+"""Posterior sampling of the rip-field H(z) model with an affine-invariant ensemble MCMC.
+
+Each chain is a Goodman & Weare (2010) stretch-move ensemble: half of the
+walkers are updated at a time from the other half, and the log-likelihood of
+all proposals is one vectorized RipHzModel.chi2 call. Independent chains run
+in a process pool, checkpoint to ../data/hz_mcmc_chains/chain_<i>.npz every
+few hundred steps and resume from there when restarted with the same
+settings. The flattened post-burn-in samples go to
+../data/rip_Hz_mcmc_samples.csv, one column per parameter, ready for a
+corner plot.
+"""
+import argparse
+import json
+import os
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+from rip_runs import load_runs
+from hz_gridsearch import RipHzModel, CHRONOMETERS
+
+PARAMETERS = ("w", "omega_rip_0", "H0", "omega_m")
+# flat priors
+BOUNDS = {
+    "w": (-1.0, 3.0),
+    "omega_rip_0": (0.0, 2.0),
+    "H0": (50.0, 90.0),
+    "omega_m": (0.05, 0.6),
+}
+CHECKPOINT_DIR = "../data/hz_mcmc_chains"
+START = {"w": 0.6, "omega_rip_0": 0.67, "H0": 67.66, "omega_m": 0.31}
+STRETCH = 2.0
+
+_model = None
+
+
+def log_probability(model, theta, data=CHRONOMETERS):
+    """Log posterior of an (n, 4) array of parameter vectors; -inf outside the priors."""
+    theta = np.atleast_2d(theta)
+    lower = np.array([BOUNDS[name][0] for name in PARAMETERS])
+    upper = np.array([BOUNDS[name][1] for name in PARAMETERS])
+    inside = np.all((theta > lower) & (theta < upper), axis=1)
+    log_prob = np.full(len(theta), -np.inf)
+    if inside.any():
+        params = dict(zip(PARAMETERS, theta[inside].T))
+        log_prob[inside] = -0.5 * model.chi2(data, **params)
+    return log_prob
+
+
+def stretch_step(model, walkers, log_prob, rng, a=STRETCH):
+    """One stretch-move update of every walker; returns the new (walkers, log_prob) and accepted flags."""
+    n_walkers, ndim = walkers.shape
+    walkers, log_prob = walkers.copy(), log_prob.copy()
+    accepted = np.zeros(n_walkers, dtype=bool)
+    half = n_walkers // 2
+    for active, other in ((slice(0, half), slice(half, None)), (slice(half, None), slice(0, half))):
+        current, partners = walkers[active], walkers[other]
+        z = ((a - 1.0) * rng.random(len(current)) + 1.0) ** 2 / a
+        chosen = partners[rng.integers(len(partners), size=len(current))]
+        proposal = chosen + z[:, None] * (current - chosen)
+        proposal_lp = log_probability(model, proposal)
+        log_accept = (ndim - 1) * np.log(z) + proposal_lp - log_prob[active]
+        accept = np.log(rng.random(len(current))) < log_accept
+        walkers[active][accept] = proposal[accept]
+        log_prob[active][accept] = proposal_lp[accept]
+        accepted[active] = accept
+    return walkers, log_prob, accepted
+
+
+def _init_worker(model):
+    global _model
+    _model = model
+
+
+def _save_checkpoint(path, chain, log_probs, accepted, rng):
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, chain=chain, log_prob=log_probs, accepted=accepted,
+             rng_state=json.dumps(rng.bit_generator.state))
+    os.replace(tmp, path)
+
+
+def run_chain(task):
+    """Advance one chain to n_steps, resuming from its checkpoint; returns (chain, log_prob, acceptance)."""
+    index, seed, n_walkers, n_steps, checkpoint_dir, checkpoint_every = task
+    path = os.path.join(checkpoint_dir, f"chain_{index}.npz")
+    rng = np.random.default_rng(seed)
+    ndim = len(PARAMETERS)
+
+    chain = np.empty((n_steps, n_walkers, ndim))
+    log_probs = np.empty((n_steps, n_walkers))
+    done, accepted = 0, 0
+    if os.path.exists(path):
+        with np.load(path) as f:
+            saved = f["chain"]
+            if saved.shape[1:] != (n_walkers, ndim):
+                raise ValueError(f"{path} was written with different walkers/parameters; remove it to restart")
+            done = min(len(saved), n_steps)
+            chain[:done], log_probs[:done] = saved[:done], f["log_prob"][:done]
+            accepted = int(f["accepted"])
+            rng.bit_generator.state = json.loads(str(f["rng_state"]))
+
+    if done:
+        walkers, log_prob = chain[done - 1], log_probs[done - 1]
+    else:
+        start = np.array([START[name] for name in PARAMETERS])
+        walkers = start * (1 + 1e-3 * rng.standard_normal((n_walkers, ndim)))
+        log_prob = log_probability(_model, walkers)
+
+    for step in range(done, n_steps):
+        walkers, log_prob, accept = stretch_step(_model, walkers, log_prob, rng)
+        chain[step], log_probs[step] = walkers, log_prob
+        accepted += int(accept.sum())
+        if (step + 1) % checkpoint_every == 0 or step + 1 == n_steps:
+            _save_checkpoint(path, chain[:step + 1], log_probs[:step + 1], accepted, rng)
+
+    return chain, log_probs, accepted / (n_steps * n_walkers)
+
+
+def sample(model, n_chains=4, n_walkers=32, n_steps=5000, seed=0, checkpoint_dir=CHECKPOINT_DIR,
+           checkpoint_every=500, workers=None):
+    """Run n_chains independent ensembles in parallel; returns (chains, log_probs, acceptance) stacked by chain."""
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    seeds = np.random.SeedSequence(seed).spawn(n_chains)
+    tasks = [(i, seeds[i], n_walkers, n_steps, checkpoint_dir, checkpoint_every) for i in range(n_chains)]
+
+    workers = min(workers or int(os.environ.get("RIP_WORKERS", 0)) or os.cpu_count() or 1, n_chains)
+    if workers <= 1:
+        _init_worker(model)
+        results = [run_chain(task) for task in tasks]
+    else:
+        with Pool(workers, initializer=_init_worker, initargs=(model,)) as pool:
+            results = pool.map(run_chain, tasks)
+
+    chains, log_probs, acceptance = zip(*results)
+    return np.stack(chains), np.stack(log_probs), np.array(acceptance)
+
+
+def samples_frame(chains, log_probs, burn_in, thin=1):
+    """Flatten (chains, steps, walkers, ndim) after burn-in into one row per sample."""
+    kept = chains[:, burn_in::thin]
+    frame = pd.DataFrame(kept.reshape(-1, kept.shape[-1]), columns=PARAMETERS)
+    frame["log_prob"] = log_probs[:, burn_in::thin].ravel()
+    frame["chain"] = np.repeat(np.arange(len(chains)), kept.shape[1] * kept.shape[2])
+    return frame
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ensemble MCMC over (w, omega_rip_0, H0, omega_m).")
+    parser.add_argument("--chains", type=int, default=4)
+    parser.add_argument("--walkers", type=int, default=32)
+    parser.add_argument("--steps", type=int, default=5000)
+    parser.add_argument("--burn-in", type=int, default=1000)
+    parser.add_argument("--thin", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="processes (default: $RIP_WORKERS or CPU count)")
+    parser.add_argument("--checkpoint-dir", default=CHECKPOINT_DIR)
+    args = parser.parse_args()
+
+    model = RipHzModel.from_runs(load_runs("../data"))
+    chains, log_probs, acceptance = sample(model, args.chains, args.walkers, args.steps, args.seed,
+                                           args.checkpoint_dir, workers=args.workers)
+    samples = samples_frame(chains, log_probs, args.burn_in, args.thin)
+
+    csv_out = "../data/rip_Hz_mcmc_samples.csv"
+    samples.to_csv(csv_out, index=False)
+    print(f"Acceptance per chain: {np.round(acceptance, 3).tolist()}")
+    for name in PARAMETERS:
+        low, mid, high = np.percentile(samples[name], [16, 50, 84])
+        print(f"{name:>12} = {mid:.4g} +{high - mid:.2g} -{mid - low:.2g}")
+    print(f"Saved {len(samples)} samples to {csv_out}")
@@ -0,0 +1,47 @@
+"""Generate every rip-de plot from a single load of the run_*.csv ensemble.
+
+The runs are parsed once by load_runs() and the same RipRuns is handed to
+each plot function, instead of every script globbing and re-reading them.
+Derived series (derivatives, statistics, ΛCDM normalisation) are memoized on
+runs.analytics, so plots that need the same one compute it once.
+"""
+import os
+import time
+import matplotlib.pyplot as plt
+from rip_runs import load_runs
+from plot_rip_field import plot_rip_field
+from plot_rip_field_fit import plot_rip_field_fit
+from plot_rip_field_overlay import plot_multi_run_overlay
+from plot_rip_field_mean_std import plot_average_with_deviation
+from plot_rip_field_derivative import plot_rip_field_derivative
+from plot_rip_field_second_derivative import plot_second_derivative
+from plot_rip_field_summary import plot_rip_field_summary
+from animate_rip_field_summary import animate_rip_field_summary
+from compare_rip_field_to_hz import compare_rip_field_to_hz
+
+
+def plot_all(data_path="../data", output_path="../assets"):
+    start = time.perf_counter()
+    runs = load_runs(data_path)
+    print(f"Loaded {len(runs)} runs x {len(runs.time)} timesteps in {time.perf_counter() - start:.2f}s")
+
+    # plot_rip_field_fit overwrites plot_rip_field's rip_field_fit.png, as when run one after the other
+    plots = [
+        lambda: plot_rip_field(runs, output_path),
+        lambda: plot_rip_field_fit(runs, output_path),
+        lambda: plot_multi_run_overlay(runs, output_path),
+        lambda: plot_average_with_deviation(runs, output_path, data_path),
+        lambda: plot_rip_field_derivative(runs, output_path),
+        lambda: plot_second_derivative(runs, output_path),
+        lambda: plot_rip_field_summary(runs, output_path),
+        lambda: animate_rip_field_summary(runs, output_path),
+        lambda: compare_rip_field_to_hz(runs, output_path),
+    ]
+    for plot in plots:
+        plot()
+        plt.close("all")
+
+
+if __name__ == "__main__":
+    here = os.path.dirname(os.path.abspath(__file__))
+    plot_all(os.path.join(here, "../data"), os.path.join(here, "../assets"))
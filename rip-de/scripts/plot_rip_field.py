@@ -1,26 +1,14 @@
-import glob
-import pandas as pd
+import os
 import matplotlib.pyplot as plt
-import numpy as np
 import shutil
 import subprocess
-from scipy.optimize import curve_fit
+from rip_runs import load_runs
+from batch_fit import fit_batch, EXPONENTIAL
 
-# Define a model to fit: exponential as a starting point
-def exp_model(t, a, b):
-    return a * np.exp(b * t)
-
-def load_and_plot(file_path):
-    df = pd.read_csv(file_path)
-    time = df['time_myr']
-    rip = df['rip_strength']
-
-    # Fit exponential model
-    try:
-        popt, _ = curve_fit(exp_model, time, rip, maxfev=10000)
-        fit_y = exp_model(time, *popt)
+def plot_fit(file_path, time, rip, popt, fit_y, converged):
+    if converged:
         label = f"{file_path} (fit: a={popt[0]:.2e}, b={popt[1]:.2e})"
-    except RuntimeError:
+    else:
         fit_y = None
         label = f"{file_path} (fit failed)"
 
@@ -31,13 +19,14 @@ def load_and_plot(file_path):
     if fit_y is not None:
         plt.plot(time, fit_y, linestyle='--', alpha=0.7)
 
-def main():
-    files = glob.glob('../data/run_*.csv')
-    files.sort()
+def plot_rip_field(runs, output_path):
+    # Fit an exponential model (a * exp(b * t)) to every run at once
+    fit = fit_batch(EXPONENTIAL, runs.time, runs.rip)
+    fit_y = fit.predict(runs.time)
 
     plt.figure(figsize=(10, 6))
-    for f in files:
-        load_and_plot(f)
+    for i, (file_path, rip) in enumerate(zip(runs.files, runs.rip)):
+        plot_fit(file_path, runs.time, rip, fit.params[i], fit_y[i], fit.converged[i])
 
     plt.xlabel('Time (million years)')
     plt.ylabel('Rip Field (arbitrary units)')
@@ -46,7 +35,7 @@ def main():
     plt.grid(True)
     plt.tight_layout()
     
-    output_file = "../assets/rip_field_fit.png"
+    output_file = os.path.join(output_path, "rip_field_fit.png")
 
     plt.savefig(output_file, dpi=300)
 
@@ -61,4 +50,4 @@ def main():
     print(f"Saved plot: {output_file}")
 
 if __name__ == "__main__":
-    main()
+    plot_rip_field(load_runs("../data"), "../assets")
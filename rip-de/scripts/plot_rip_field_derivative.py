@@ -1,25 +1,14 @@
-import pandas as pd
 import matplotlib.pyplot as plt
-import numpy as np
-import glob
 import os
 import shutil
 import subprocess
+from rip_runs import load_runs
 
-def plot_rip_field_derivative(data_path, output_path):
-    all_files = sorted(glob.glob(os.path.join(data_path, "run_*.csv")))
-    derivatives = []
-
-    for file_path in all_files:
-        df = pd.read_csv(file_path)
-        time = df['time_myr'].values
-        rip = df['rip_strength'].values
-        delta_rip = np.gradient(rip, time)  # first derivative
-        derivatives.append(delta_rip)
-
-    derivatives = np.array(derivatives)
-    mean_derivative = np.mean(derivatives, axis=0)
-    std_derivative = np.std(derivatives, axis=0)
+def plot_rip_field_derivative(runs, output_path):
+    time = runs.time
+    derivative = runs.analytics.derivative_stats  # shared with the other plots
+    mean_derivative = derivative.mean
+    std_derivative = derivative.std()
 
     plt.figure(figsize=(12, 7))
     plt.plot(time, mean_derivative, label="Mean d(Rip Field)/dt", color='blue')
@@ -33,7 +22,7 @@ def plot_rip_field_derivative(data_path, output_path):
     plt.grid(True)
     plt.tight_layout()
 
-    output_file = os.path.join(output_path, "../assets/rip_field_derivative.png")
+    output_file = os.path.join(output_path, "rip_field_derivative.png")
     plt.savefig(output_file, dpi=300)
 
     if shutil.which('optipng.exe'):
@@ -47,4 +36,4 @@ def plot_rip_field_derivative(data_path, output_path):
     print(f"Saved plot to: {output_file}")
 
 if __name__ == "__main__":
-    plot_rip_field_derivative("../data", ".")
+    plot_rip_field_derivative(load_runs("../data"), "../assets")
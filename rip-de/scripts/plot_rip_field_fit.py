@@ -1,50 +1,46 @@
 # scripts/plot_rip_field_fit.py   ← NEW
-import os, glob, json
-import numpy as np
-import pandas as pd
+import os, json
 import matplotlib.pyplot as plt
 import shutil
 import subprocess
-from scipy.optimize import curve_fit
-
-# ---------- logistic model ----------
-def logistic(t, L, k, t0, C):
-    """4-parameter logistic:  L / (1+exp(-k*(t - t0))) + C"""
-    return L / (1 + np.exp(-k * (t - t0))) + C
+from rip_runs import load_runs
+from batch_fit import fit_batch, parameter_summary, LOGISTIC
+from bootstrap_fit import bootstrap_fit, bootstrap_intervals, N_BOOTSTRAP
 
 # ---------- main ----------
-def main():
-    # 1. load mean rip-field
-    run_files = sorted(glob.glob("../data/run_*.csv"))
-
-    if not run_files:
-        raise FileNotFoundError("No run_*.csv files found in rip-de/data/")
-
-    rip_runs  = [pd.read_csv(f)["rip_strength"].values for f in run_files]
-    rip_mean  = np.mean(rip_runs, axis=0)
-    time_myr  = pd.read_csv(run_files[0])["time_myr"].values        # common x-axis
+def plot_rip_field_fit(runs, output_path, n_bootstrap=N_BOOTSTRAP):
+    # 1. mean rip-field
+    rip_mean  = runs.mean()
+    time_myr  = runs.time                                            # common x-axis
 
     # 2. fit only the rise section (≤ 7 Gyr)
     mask      = time_myr <= 7000                                     # 0–7 Gyr
     x_fit     = time_myr[mask]
-    y_fit     = rip_mean[mask]
 
+    # 4-parameter logistic  L / (1+exp(-k*(t - t0))) + C
     # initial guesses:  L=max(y); k=1e-3; t0=half-rise; C=min(y)
-    p0 = [y_fit.max(), 1e-3, x_fit[np.argmax(np.diff(y_fit))], y_fit.min()]
-    popt, pcov = curve_fit(logistic, x_fit, y_fit, p0=p0, maxfev=20000)
-    L,k,t0,C = popt
+    # plus n_bootstrap refits of resampled-run means for the error bars
+    mean_fit, replicates = bootstrap_fit(LOGISTIC, x_fit, runs.rip[:, mask], n_bootstrap)
+    if not mean_fit.converged[0]:
+        # as curve_fit did: don't plot or save a fit that didn't converge
+        raise RuntimeError(f"logistic fit of the mean rip field did not converge "
+                           f"after {mean_fit.iterations[0]} iterations")
+    L,k,t0,C  = mean_fit.params[0]
+
+    # ... and of every run, for the parameter distributions
+    run_fits  = fit_batch(LOGISTIC, x_fit, runs.rip[:, mask])
 
     # 3. plot
     plt.figure(figsize=(12,7))
     plt.plot(time_myr, rip_mean, label="Mean rip field", color="steelblue")
-    plt.plot(time_myr, logistic(time_myr,*popt), "--", color="crimson",
+    plt.plot(time_myr, mean_fit.predict(time_myr)[0], "--", color="crimson",
              label=f"Logistic fit\nL={L:.3e}, k={k:.2e}, t0={t0:.0f} Myr")
     plt.xlabel("Time (million years)")
     plt.ylabel("Rip field (arbitrary units)")
     plt.title("Rip Field Evolution & Logistic Fit (0–7 Gyr calibrated)")
     plt.legend(); plt.grid(True); plt.tight_layout()
 
-    output_file  = "../assets/rip_field_fit.png"
+    output_file  = os.path.join(output_path, "rip_field_fit.png")
     plt.savefig(output_file, dpi=300)
 
     if shutil.which('optipng.exe'):
@@ -58,9 +54,10 @@ def main():
     print("Saved fit plot: ", output_file)
 
     # 4. save parameters for paper
-    out_json = "../assets/rip_fit_params.json"
-    with open(out_json,"w") as f: json.dump(dict(L=L, k=k, t0=t0, C=C), f, indent=2)
+    out_json = os.path.join(output_path, "rip_fit_params.json")
+    with open(out_json,"w") as f: json.dump(dict(L=L, k=k, t0=t0, C=C, runs=parameter_summary(run_fits),
+                                           bootstrap=bootstrap_intervals(replicates)), f, indent=2)
     print("Saved parameters: ", out_json)
 
 if __name__ == "__main__":
-    main()
+    plot_rip_field_fit(load_runs("../data"), "../assets")
@@ -1,23 +1,15 @@
-import pandas as pd
 import matplotlib.pyplot as plt
-import numpy as np
-import glob
 import os
 import shutil
 import subprocess
+from rip_runs import load_runs
 
-def plot_average_with_deviation(data_path, output_path):
-    all_files = sorted(glob.glob(os.path.join(data_path, "run_*.csv")))
-    rip_data = []
-
-    for file_path in all_files:
-        df = pd.read_csv(file_path)
-        rip_data.append(df['rip_strength'].values)
-
-    rip_array = np.asarray(rip_data, dtype=np.float64)
-    mean_rip = np.mean(rip_array, axis=0)
-    std_rip = np.std(rip_array, axis=0)
-    time = pd.read_csv(all_files[0])['time_myr'].values
+def plot_average_with_deviation(runs, output_path, data_path):
+    # one streaming pass over the runs, O(n_times) memory, shared with the other plots
+    stats = runs.analytics.stats
+    mean_rip = stats.rip.mean
+    std_rip = stats.rip.std()
+    time = runs.time
 
     # Plot
     plt.figure(figsize=(12, 7))
@@ -31,7 +23,7 @@ def plot_average_with_deviation(data_path, output_path):
     plt.tight_layout()
 
     # Save plot to assets
-    output_file = os.path.join(output_path, "../assets/rip_field_mean_std.png")    
+    output_file = os.path.join(output_path, "rip_field_mean_std.png")    
     plt.savefig(output_file, dpi=300)
 
     if shutil.which('optipng.exe'):
@@ -47,13 +39,8 @@ def plot_average_with_deviation(data_path, output_path):
 
     # ✅ Save the mean and std data to data/rip_field_mean_std.csv
     csv_path = os.path.join(data_path, "rip_field_mean_std.csv")
-    df_out = pd.DataFrame({
-        "time_myr": time,
-        "rip_mean": mean_rip,
-        "rip_std": std_rip
-    })
-    df_out.to_csv(csv_path, index=False)
+    stats.to_csv(csv_path)
     print(f"Saved data to: {csv_path}")
 
 if __name__ == "__main__":
-    plot_average_with_deviation("../data", ".")
+    plot_average_with_deviation(load_runs("../data"), "../assets", "../data")
@@ -1,22 +1,17 @@
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-import glob
 import os
 import shutil
 import subprocess
+from rip_runs import load_runs
 
-def plot_multi_run_overlay(data_path, output_path):
+def plot_multi_run_overlay(runs, output_path):
     plt.figure(figsize=(12, 7))
-    all_files = sorted(glob.glob(os.path.join(data_path, "run_*.csv")))
 
-    for file_path in all_files:
-        df = pd.read_csv(file_path)
-        time = df['time_myr']
-        rip_field = df['rip_strength']
+    for file_path, rip_field in zip(runs.files, runs.rip):
         label = os.path.basename(file_path)
-        plt.plot(time, rip_field, label=label)
+        plt.plot(runs.time, rip_field, label=label)
 
     plt.xlabel("Time (million years)")
     plt.ylabel("Rip Field (arbitrary units)")
@@ -37,4 +32,4 @@ def plot_multi_run_overlay(data_path, output_path):
     print(f"Saved plot to: {output_file}")
 
 if __name__ == "__main__":
-    plot_multi_run_overlay("../data", "../assets")
+    plot_multi_run_overlay(load_runs("../data"), "../assets")
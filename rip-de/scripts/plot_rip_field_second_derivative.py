@@ -1,29 +1,17 @@
 
-import pandas as pd
 import matplotlib.pyplot as plt
-import numpy as np
-import glob
 import os
 import shutil
 import subprocess
+from rip_runs import load_runs
 
-def plot_second_derivative(data_path, output_path):
-    all_files = sorted(glob.glob(os.path.join(data_path, "run_*.csv")))
-    rip_data = []
+def plot_second_derivative(runs, output_path):
+    time = runs.time
 
-    for file_path in all_files:
-        df = pd.read_csv(file_path)
-        rip_data.append(df['rip_strength'].values)
-
-    rip_array = np.asarray(rip_data, dtype=np.float64)
-    time = pd.read_csv(all_files[0])['time_myr'].values
-
-    # First and second derivatives
-    first_deriv = np.gradient(rip_array, axis=1)
-    second_deriv = np.gradient(first_deriv, axis=1)
-
-    mean_second = np.mean(second_deriv, axis=0)
-    std_second = np.std(second_deriv, axis=0)
+    # Second derivative against time_myr, shared with the other plots
+    second_deriv = runs.analytics.second_derivative_stats
+    mean_second = second_deriv.mean
+    std_second = second_deriv.std()
 
     # Plot
     plt.figure(figsize=(12, 7))
@@ -32,7 +20,7 @@ def plot_second_derivative(data_path, output_path):
                      color='salmon', alpha=0.3, label="±1 Std Dev")
 
     plt.xlabel("Time (million years)")
-    plt.ylabel("Acceleration of Rip Field")
+    plt.ylabel("Acceleration of Rip Field (per Myr²)")
     plt.title("Curvature of Rip Field (Second Derivative)")
     plt.legend()
     plt.grid(True)
@@ -53,4 +41,4 @@ def plot_second_derivative(data_path, output_path):
     print(f"Saved plot to: {output_file}")
 
 if __name__ == "__main__":
-    plot_second_derivative("../data", "../assets")
+    plot_second_derivative(load_runs("../data"), "../assets")
@@ -0,0 +1,45 @@
+"""The rip-de run_*.csv ensemble, loaded once and shared by every plot.
+
+load_runs() maps the (n_runs, n_times) ensemble store, parsing only run
+files that are new since the last call; the plot functions in this folder
+take the resulting RipRuns instead of globbing and re-reading the CSVs
+themselves.
+"""
+import os
+from functools import cached_property
+
+import pandas as pd
+from ensemble_store import sync_runs
+from ensemble_analytics import EnsembleAnalytics
+
+
+class RipRuns:
+    """rip_strength of every run (rows of .rip) against the shared .time axis in Myr."""
+
+    def __init__(self, files, time, rip):
+        self.files = list(files)
+        self.labels = [os.path.splitext(os.path.basename(f))[0] for f in self.files]
+        self.time = time
+        self.rip = rip
+
+    def __len__(self):
+        return len(self.files)
+
+    def mean(self):
+        return self.rip.mean(axis=0)
+
+    @cached_property
+    def analytics(self):
+        """Memoized derivatives, statistics and ΛCDM normalisation shared by every plot of these runs."""
+        return EnsembleAnalytics(self.time, self.rip, self.labels)
+
+    def frame(self):
+        """Runs as columns (run_0, run_1, ...) of a DataFrame indexed by time_myr."""
+        return pd.DataFrame(self.rip.T, index=pd.Index(self.time, name="time_myr"), columns=self.labels)
+
+
+def load_runs(data_path="../data", pattern="run_*.csv"):
+    """Sync the ensemble store with data_path and return its runs (rip is memory-mapped)."""
+    store = sync_runs(data_path, pattern)
+    files = [os.path.join(data_path, name) for name in store.runs]
+    return RipRuns(files, store.time, store.rip)
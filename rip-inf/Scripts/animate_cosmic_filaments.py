@@ -1,11 +1,10 @@
-import pandas as pd
-import gzip
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from mpl_toolkits.mplot3d import Axes3D
 import matplotlib.cm as cm
 import matplotlib.colors as mcolors
 import subprocess
+from inflation_cache import open_cache
 
 # Parameters
 CSV_PATH = "../data/inflation.csv.gz"
@@ -16,16 +15,16 @@ DENSITY_THRESHOLD = 0.001  # apply after smoothing
 POINT_SIZE = 8
 ALPHA = 0.6
 
-# Load data
-with gzip.open(CSV_PATH, "rt") as f:
-	df = pd.read_csv(f)
+# Load data (memory-mapped column cache, one timestep at a time)
+cache = open_cache(CSV_PATH)
+density_max = cache.max("matter_density_smoothed")
 
-# Normalize smoothed density
-df["density_norm"] = df["matter_density_smoothed"] / df["matter_density_smoothed"].max()
+def load_frame(t):
+	frame = cache.timestep(t, ["col", "row", "layer", "matter_density_smoothed"])
+	frame["density_norm"] = frame["matter_density_smoothed"] / density_max
+	return frame
 
-# Organize by timestep
-timesteps = sorted(df["timestep"].unique())
-frames = [df[df["timestep"] == t] for t in timesteps]
+timesteps = list(cache.timesteps)
 
 # Set up figure
 fig = plt.figure()
@@ -50,21 +49,22 @@ cbar.set_label("Normalized Smoothed Density")
 sc = ax.scatter([], [], [], s=POINT_SIZE, alpha=ALPHA, c=[], cmap="inferno", vmin=0, vmax=1)
 
 # Lock layout with frame 0
-init = frames[0][frames[0]["density_norm"] > DENSITY_THRESHOLD]
+init = load_frame(timesteps[0])
+init = init[init["density_norm"] > DENSITY_THRESHOLD]
 sc._offsets3d = (init["col"], init["row"], init["layer"])
 sc.set_array(init["density_norm"])
 plt.draw()
 
 # Animation function
 def update(frame_idx):
-	frame = frames[frame_idx]
+	frame = load_frame(timesteps[frame_idx])
 	frame = frame[frame["density_norm"] > DENSITY_THRESHOLD]
 	sc._offsets3d = (frame["col"], frame["row"], frame["layer"])
 	sc.set_array(frame["density_norm"])
 	return sc,
 
 # Animate
-ani = animation.FuncAnimation(fig, update, frames=len(frames), interval=100, blit=True)
+ani = animation.FuncAnimation(fig, update, frames=len(timesteps), interval=100, blit=True)
 ani.save(OUTPUT_PATH, writer="pillow")
 
 # Optimize with gifsicle
@@ -1,9 +1,11 @@
-import pandas as pd
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import numpy as np
 import subprocess
 from matplotlib.collections import LineCollection
+from inflation_cache import open_cache
+from cell_volume import read_layer
+from filament_edges import neighbor_segments
+from parallel_render import render_animation
 
 # --- config ---
 csv_path = '../data/inflation.csv.gz'
@@ -12,76 +14,53 @@ timesteps_to_use = 100
 output_gif = '../assets/filament_growth.gif'
 density_threshold = 0.005  # adjust to sharpen filament edges
 
-# --- load data ---
-print("Loading data...")
-df = pd.read_csv(csv_path)
+def load_layers():
+	"""Density and black-hole images of the plotted layer, one per frame."""
+	print("Loading data...")
+	cache = open_cache(csv_path)
+	timesteps = cache.timesteps[:timesteps_to_use]
+	density = read_layer(cache, 'matter_density_smoothed', layer_to_plot, timesteps)
+	black_holes = read_layer(cache, 'is_black_hole', layer_to_plot, timesteps)
+	for t in range(len(timesteps)):
+		print(f"Timestep {t}: max density = {density[t].max():.5f}")
+	return density, black_holes
 
-# --- grid size ---
-cols = df['col'].max() + 1
-rows = df['row'].max() + 1
-max_timestep = df['timestep'].max()
+def setup(density, black_holes):
+	rows, cols = density.shape[1:]
 
-# --- plot setup ---
-plt.style.use('dark_background')
-fig, ax = plt.subplots()
-grid = np.zeros((rows, cols))
-im = ax.imshow(grid, cmap='binary', origin='lower', vmin=0, vmax=1)
-scatter = ax.scatter([], [], s=1, c='cyan', marker='o')  # black hole overlay
-ax.set_title('Filament Growth')
-
-def update(frame):
-	t = frame
-	slice_df = df[(df['timestep'] == t) & (df['layer'] == layer_to_plot)]
-	print(f"Timestep {t}: max density = {slice_df['matter_density_smoothed'].max():.5f}")
-	grid = np.zeros((rows, cols))
-
-	# mark dense cells
-	for _, row in slice_df.iterrows():
-		val = row['matter_density_smoothed']
-		if val >= density_threshold:
-			grid[int(row['row']), int(row['col'])] = 1
-
-	# clear axes and reset background
-	ax.clear()
-	ax.set_title(f"Timestep {t}")
+	# --- plot setup ---
+	plt.style.use('dark_background')
+	fig, ax = plt.subplots()
 	ax.set_xlim(0, cols)
 	ax.set_ylim(0, rows)
 	ax.set_facecolor('black')
+	title = ax.set_title('Filament Growth')
+
+	# filaments as white lines, black holes as cyan dots
+	lc = ax.add_collection(LineCollection([], colors='white', linewidths=0.4))
+	scatter = ax.scatter([], [], s=1, c='cyan', marker='o')
 
-	# collect line segments between adjacent high-density cells
-	lines = []
-	for r in range(rows):
-		for c in range(cols):
-			if grid[r, c] == 1:
-				for dr in [-1, 0, 1]:
-					for dc in [-1, 0, 1]:
-						if dr == 0 and dc == 0:
-							continue
-						nr, nc = r + dr, c + dc
-						if 0 <= nr < rows and 0 <= nc < cols and grid[nr, nc] == 1:
-							lines.append([(c, r), (nc, nr)])
+	return fig, dict(density=density, black_holes=black_holes, title=title, lc=lc, scatter=scatter)
 
-	# draw filaments as white lines
-	if lines:
-		lc = LineCollection(lines, colors='white', linewidths=0.4)
-		ax.add_collection(lc)
+def update(ctx, t):
+	ctx['title'].set_text(f"Timestep {t}")
 
-	# overlay black holes as cyan dots
-	bh = slice_df[slice_df['is_black_hole'] == 1]
-	ax.scatter(bh['col'], bh['row'], s=1, c='cyan', marker='o')
+	# line segments between adjacent high-density cells
+	ctx['lc'].set_segments(neighbor_segments(ctx['density'][t] >= density_threshold))
 
-	return []
+	bh_rows, bh_cols = np.nonzero(ctx['black_holes'][t])
+	ctx['scatter'].set_offsets(np.column_stack([bh_cols, bh_rows]))
 
-# --- animation ---
-print("Creating animation...")
-ani = animation.FuncAnimation(fig, update, frames=range(0, min(max_timestep + 1, timesteps_to_use)), blit=True)
+if __name__ == "__main__":
+	density, black_holes = load_layers()
 
-# --- save gif ---
-ani.save(output_gif, writer='pillow', fps=5)
-print(f"Saved animation: {output_gif}")
+	# --- animation ---
+	print("Creating animation...")
+	render_animation(setup, update, range(len(density)), output_gif, fps=5, setup_args=(density, black_holes))
+	print(f"Saved animation: {output_gif}")
 
-# --- compress gif if gifsicle is installed ---
-try:
-	subprocess.run(["gifsicle", "-O3", "--colors", "256", "-i", output_gif, "-o", output_gif], check=True)
-except FileNotFoundError:
-	print("gifsicle not found. Skipping compression.")
+	# --- compress gif if gifsicle is installed ---
+	try:
+		subprocess.run(["gifsicle", "-O3", "--colors", "256", "-i", output_gif, "-o", output_gif], check=True)
+	except FileNotFoundError:
+		print("gifsicle not found. Skipping compression.")
@@ -1,11 +1,11 @@
 
-import pandas as pd
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import numpy as np
-import subprocess
 from matplotlib.collections import LineCollection
-from matplotlib.animation import FFMpegWriter
+from inflation_cache import open_cache
+from cell_volume import read_layer
+from filament_age import EdgeAgeStore
+from parallel_render import render_animation
 
 # --- config ---
 csv_path = '../data/inflation.csv.gz'
@@ -14,82 +14,64 @@ timesteps_to_use = 100
 output_video = '../assets/filament_growth_crystal.mp4'
 density_threshold = 0.01
 
-# --- load data ---
-print("Loading data...")
-df = pd.read_csv(csv_path)
-
-# --- grid size ---
-cols = df['col'].max() + 1
-rows = df['row'].max() + 1
-max_timestep = df['timestep'].max()
-
-# --- plot setup ---
-plt.style.use('dark_background')
-fig, ax = plt.subplots()
-ax.set_facecolor('black')
-
-# persistent line storage with age tracking
-all_lines = {}
-
-def update(frame):
-    t = frame
-    slice_df = df[(df['timestep'] == t) & (df['layer'] == layer_to_plot)]
-    grid = np.zeros((rows, cols))
-
-    for _, row in slice_df.iterrows():
-        val = row['matter_density_smoothed']
-        if val >= density_threshold:
-            grid[int(row['row']), int(row['col'])] = 1
-
-    for r in range(rows):
-        for c in range(cols):
-            if grid[r, c] == 1:
-                for dr in [-1, 0, 1]:
-                    for dc in [-1, 0, 1]:
-                        if dr == 0 and dc == 0:
-                            continue
-                        nr, nc = r + dr, c + dc
-                        if 0 <= nr < rows and 0 <= nc < cols and grid[nr, nc] == 1:
-                            line = tuple(sorted([(c, r), (nc, nr)]))
-                            if line not in all_lines:
-                                all_lines[line] = t
-
-    ax.clear()
+def load_state():
+    """Filament age store and black-hole images for every frame."""
+    print("Loading data...")
+    cache = open_cache(csv_path)
+    density = read_layer(cache, 'matter_density_smoothed', layer_to_plot)
+    black_holes = read_layer(cache, 'is_black_hole', layer_to_plot)
+
+    # persistent line storage with age tracking
+    n_frames = min(len(cache.timesteps), timesteps_to_use)
+    edge_ages = EdgeAgeStore(*density.shape[1:])
+    for t in range(n_frames):
+        edge_ages.update(density[t] >= density_threshold, t)
+    return edge_ages, black_holes[:n_frames]
+
+def setup(edge_ages, black_holes):
+    rows, cols = black_holes.shape[1:]
+
+    # --- plot setup ---
+    plt.style.use('dark_background')
+    fig, ax = plt.subplots()
     ax.set_xlim(0, cols)
     ax.set_ylim(0, rows)
     ax.set_facecolor('black')
-    ax.set_title(f"Timestep {t}")
+    title = ax.set_title("")
 
-    if all_lines:
-        lines = list(all_lines.keys())
-        ages = np.array([t - ts for ts in all_lines.values()])
-        norm = plt.Normalize(0, timesteps_to_use)
-        glow_colors = plt.cm.winter(1 - norm(ages) ** 0.7)
+    # Glow layer (soft blue, thick) and core layer (sharp white, thin)
+    glow = ax.add_collection(LineCollection([], linewidths=2.5, alpha=0.3))
+    crisp = ax.add_collection(LineCollection([], colors='white', linewidths=0.4, alpha=1.0))
 
-        # Glow layer (soft blue, thick)
-        glow = LineCollection(lines, colors=glow_colors, linewidths=2.5, alpha=0.3)
-        # Core layer (sharp white, thin)
-        crisp = LineCollection(lines, colors='white', linewidths=0.4, alpha=1.0)
+    # black holes as icy pulses
+    bh = ax.scatter([], [], s=4, c='aqua', alpha=0.6, marker='o')
 
-        ax.add_collection(glow)
-        ax.add_collection(crisp)
+    # optional: sparkle stars (static, first frame only)
+    rng = np.random.RandomState(42)
+    star_x = rng.randint(0, cols, 60)
+    star_y = rng.randint(0, rows, 60)
+    stars = ax.scatter(star_x, star_y, s=0.5, c='lightcyan', alpha=0.2, marker='*')
 
-    # black holes as icy pulses
-    bh = slice_df[slice_df['is_black_hole'] == 1]
-    ax.scatter(bh['col'], bh['row'], s=4, c='aqua', alpha=0.6, marker='o')
+    return fig, dict(edge_ages=edge_ages, black_holes=black_holes, title=title,
+                     glow=glow, crisp=crisp, bh=bh, stars=stars)
+
+def update(ctx, t):
+    ctx['title'].set_text(f"Timestep {t}")
 
-    # optional: sparkle stars (static)
-    if t == 0:
-        np.random.seed(42)
-        star_x = np.random.randint(0, cols, 60)
-        star_y = np.random.randint(0, rows, 60)
-        ax.scatter(star_x, star_y, s=0.5, c='lightcyan', alpha=0.2, marker='*')
+    lines, ages = ctx['edge_ages'].edges(t)
+    norm = plt.Normalize(0, timesteps_to_use)
+    ctx['glow'].set_segments(lines)
+    ctx['glow'].set_color(plt.cm.winter(1 - norm(ages) ** 0.7))
+    ctx['crisp'].set_segments(lines)
 
-    return []
+    bh_rows, bh_cols = np.nonzero(ctx['black_holes'][t])
+    ctx['bh'].set_offsets(np.column_stack([bh_cols, bh_rows]))
+    ctx['stars'].set_visible(t == 0)
 
 # --- animation ---
-print("Creating animation...")
-writer = FFMpegWriter(fps=5, metadata=dict(artist='RipField'), bitrate=1800)
-ani = animation.FuncAnimation(fig, update, frames=range(0, min(max_timestep + 1, timesteps_to_use)), blit=True)
-ani.save(output_video, writer=writer)
-print(f"Saved animation: {output_video}")
+if __name__ == "__main__":
+    edge_ages, black_holes = load_state()
+    print("Creating animation...")
+    render_animation(setup, update, range(len(black_holes)), output_video, fps=5,
+                     setup_args=(edge_ages, black_holes), metadata=dict(artist='RipField'), bitrate=1800)
+    print(f"Saved animation: {output_video}")
@@ -1,8 +1,9 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import numpy as np
 import subprocess
+from inflation_cache import open_cache
+from cell_volume import read_layer
+from frame_raster import Raster
+from parallel_render import write_frames
 
 # --- config ---
 csv_path = '../data/inflation.csv.gz'
@@ -10,48 +11,32 @@ layer_to_plot = 5
 timesteps_to_use = 100
 output_gif = '../assets/filament_growth_hm.gif'
 density_threshold = 0.03  # adjust to sharpen filament edges
+upscale = 8  # output pixels per cell
 
-# --- load data ---
+# --- load data (only the plotted layer) ---
 print("Loading data...")
-df = pd.read_csv(csv_path)
+cache = open_cache(csv_path)
+timesteps = cache.timesteps[:timesteps_to_use]
+density = read_layer(cache, 'matter_density_smoothed', layer_to_plot, timesteps)
+black_holes = read_layer(cache, 'is_black_hole', layer_to_plot, timesteps)
 
-# --- grid size ---
-cols = df['col'].max() + 1
-rows = df['row'].max() + 1
-max_timestep = df['timestep'].max()
+# --- frame setup ---
+raster = Raster(*density.shape[1:], scale=upscale, origin='lower')
 
-# --- plot setup ---
-plt.style.use('dark_background')
-fig, ax = plt.subplots()
-grid = np.zeros((rows, cols))
-im = ax.imshow(grid, cmap='binary', origin='lower', vmin=0, vmax=1)
-scatter = ax.scatter([], [], s=1, c='cyan', marker='o')  # black hole overlay
-ax.set_title('Filament Growth')
+def render(t):
+	raster.slice(density[t] >= density_threshold, 'binary', vmin=0, vmax=1)
 
-def update(frame):
-	t = frame
-	slice_df = df[(df['timestep'] == t) & (df['layer'] == layer_to_plot)]
-	grid = np.zeros((rows, cols))
+	# black hole overlay
+	bh_rows, bh_cols = np.nonzero(black_holes[t])
+	raster.points(bh_rows, bh_cols, 'cyan', radius=upscale // 4)
 
-	for _, row in slice_df.iterrows():
-		val = row['matter_density_smoothed']
-		grid[int(row['row']), int(row['col'])] = 1 if val >= density_threshold else 0
+	raster.caption(f'Filament Growth - Timestep {t}')
 
-	im.set_data(grid)
-	ax.set_title(f'Timestep {t}')
-
-	# update black holes
-	bh = slice_df[slice_df['is_black_hole'] == 1]
-	scatter.set_offsets(bh[['col', 'row']].values)
-
-	return [im, scatter]
+	return raster.image.copy()
 
 # --- animation ---
 print("Creating animation...")
-ani = animation.FuncAnimation(fig, update, frames=range(0, min(max_timestep + 1, timesteps_to_use)), blit=True)
-
-# --- save gif ---
-ani.save(output_gif, writer='pillow', fps=5)
+write_frames((render(t) for t in range(len(timesteps))), output_gif, fps=5)
 print(f"Saved animation: {output_gif}")
 
 # --- compress gif if gifsicle is installed ---
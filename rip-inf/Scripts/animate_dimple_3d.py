@@ -1,11 +1,10 @@
-import pandas as pd
-import gzip
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from mpl_toolkits.mplot3d import Axes3D
 import subprocess
 import matplotlib.cm as cm
 import matplotlib.colors as mcolors
+from inflation_cache import open_cache
 
 # Parameters
 CSV_PATH = "../data/inflation.csv.gz"
@@ -15,16 +14,16 @@ TIMESTEPS = 100
 DOWNSAMPLE_FACTOR = 4
 CURVATURE_THRESHOLD = 0.2  # normalized
 
-# Load data
-with gzip.open(CSV_PATH, "rt") as f:
-	df = pd.read_csv(f)
+# Load data (memory-mapped column cache, one timestep at a time)
+cache = open_cache(CSV_PATH)
+curvature_max = cache.max("curvature")
 
-# Normalize curvature
-df["curvature_norm"] = df["curvature"] / df["curvature"].max()
+def load_frame(t):
+	frame = cache.timestep(t, ["col", "row", "layer", "curvature"])
+	frame["curvature_norm"] = frame["curvature"] / curvature_max
+	return frame
 
-# Group by timestep
-timesteps = sorted(df["timestep"].unique())
-frames = [df[df["timestep"] == t] for t in timesteps]
+timesteps = list(cache.timesteps)
 
 # Set up plot
 fig = plt.figure()
@@ -51,17 +50,18 @@ ax.set_ylabel("row")
 ax.set_zlabel("layer")
 
 # Pre-draw layout to lock it in
-update_frame = frames[0][(frames[0]["col"] % DOWNSAMPLE_FACTOR == 0) &
-                         (frames[0]["row"] % DOWNSAMPLE_FACTOR == 0) &
-                         (frames[0]["layer"] % DOWNSAMPLE_FACTOR == 0) &
-                         (frames[0]["curvature_norm"] > CURVATURE_THRESHOLD)]
+first_frame = load_frame(timesteps[0])
+update_frame = first_frame[(first_frame["col"] % DOWNSAMPLE_FACTOR == 0) &
+                           (first_frame["row"] % DOWNSAMPLE_FACTOR == 0) &
+                           (first_frame["layer"] % DOWNSAMPLE_FACTOR == 0) &
+                           (first_frame["curvature_norm"] > CURVATURE_THRESHOLD)]
 sc._offsets3d = (update_frame["col"], update_frame["row"], update_frame["layer"])
 sc.set_array(update_frame["curvature_norm"])
 plt.draw()
 
 # Animation update
 def update(frame_idx):
-	frame = frames[frame_idx]
+	frame = load_frame(timesteps[frame_idx])
 	frame = frame[(frame["col"] % DOWNSAMPLE_FACTOR == 0) &
 	              (frame["row"] % DOWNSAMPLE_FACTOR == 0) &
 	              (frame["layer"] % DOWNSAMPLE_FACTOR == 0)]
@@ -71,7 +71,7 @@ def update(frame_idx):
 	return sc,
 
 # Animate
-ani = animation.FuncAnimation(fig, update, frames=len(frames), interval=100, blit=False)
+ani = animation.FuncAnimation(fig, update, frames=len(timesteps), interval=100, blit=False)
 ani.save(OUTPUT_PATH, writer="pillow")
 
 # Optional: Compress with gifsicle
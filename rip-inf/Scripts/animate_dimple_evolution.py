@@ -1,49 +1,35 @@
-import pandas as pd
-import gzip
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import subprocess
 from PIL import Image, ImageSequence
+from inflation_cache import open_cache
+from cell_volume import read_layer
+from frame_raster import Raster
+from parallel_render import write_frames
 
 # Parameters
 LAYER = 32         # slice index
 OUTPUT_FILE = "../assets/curvature_animation.gif"
 CSV_PATH = "../data/inflation.csv.gz"
-GRID_SIZE = 64
 TIMESTEPS = 100
+UPSCALE = 6        # output pixels per cell
+INTERVAL = 150     # ms per frame
 
-# Load and parse data
-with gzip.open(CSV_PATH, "rt") as f:
-    df = pd.read_csv(f)
+# Load (row, col) images of the layer
+cache = open_cache(CSV_PATH)
+timesteps = cache.timesteps[:TIMESTEPS]
+curvature = read_layer(cache, "curvature", LAYER, timesteps)
+black_holes = read_layer(cache, "is_black_hole", LAYER, timesteps)
 
-# Precompute frames
-frames = []
-for t in range(TIMESTEPS):
-    start = t * GRID_SIZE**3
-    end = (t + 1) * GRID_SIZE**3
-    frame = df.iloc[start:end]
-    frame = frame[frame["layer"] == LAYER]       
-    curvature_grid = frame.pivot(index="row", columns="col", values="curvature").values
-    bh_mask = frame["is_black_hole"].astype(bool).values.reshape((GRID_SIZE, GRID_SIZE))
-    frames.append((curvature_grid, bh_mask))
+# Rasterize each frame straight into an RGB buffer
+raster = Raster(*curvature.shape[1:], scale=UPSCALE)
 
-# Plot setup
-fig, ax = plt.subplots(figsize=(6, 6))
-cax = ax.imshow(frames[0][0], cmap="plasma", vmin=0, vmax=0.3)
-bh_overlay = ax.imshow(frames[0][1], cmap="Reds", alpha=0.4, vmin=0, vmax=1)
-ax.set_title(f"Spacetime Curvature at Layer {LAYER}")
-plt.axis("off")
-
-# Update function
-def update(i):
-    cax.set_data(frames[i][0])
-    bh_overlay.set_data(frames[i][1])
-    ax.set_title(f"Timestep {i} - Layer {LAYER}")
-    return [cax, bh_overlay]
+def render(i):
+    raster.slice(curvature[i], "plasma", vmin=0, vmax=0.3)
+    raster.slice(black_holes[i], "Reds", vmin=0, vmax=1, alpha=0.4)
+    raster.caption(f"Timestep {i} - Layer {LAYER}")
+    return raster.image.copy()
 
 # Animate
-ani = animation.FuncAnimation(fig, update, frames=len(frames), interval=150, blit=True)
-ani.save(OUTPUT_FILE, writer="pillow")
+write_frames((render(i) for i in range(len(timesteps))), OUTPUT_FILE, fps=1000 / INTERVAL)
 
 # ---------- Shrink with gifsicle if available ----------
 try:
@@ -3,12 +3,13 @@ import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import os
 import subprocess
+from growing_lines import GrowingLines
 
-if not os.path.exists('../data/simulation.csv') and os.path.exists('../data/structure.csv.gz'):
+if not os.path.exists('../data/simulation.csv') and os.path.exists('../data/simulation.csv.gz'):
     import gzip
-    with gzip.open('../data/structure.csv.gz', 'rb') as f_in:
-        with open('../data/structure.csv', 'wb') as f_out:
-            f_out.write(f_in.read())            
+    with gzip.open('../data/simulation.csv.gz', 'rb') as f_in:
+        with open('../data/simulation.csv', 'wb') as f_out:
+            f_out.write(f_in.read())
 
 # load the csv
 df = pd.read_csv('../data/simulation.csv', dtype={
@@ -41,16 +42,17 @@ ax.grid(True, which="both", ls="--")
 line, = ax.plot([], [], lw=2, label='Scale Factor')
 ax.legend()
 
+# rows sorted by time once; frame i shows every row up to its time
+growing = GrowingLines([line], df['time'], df['scale_factor'])
+frame_lengths = growing.prefix_lengths(time_only_df['time'].to_numpy())
+
 # set axis limits once
 ax.set_xlim(df['time'].min(), df['time'].max())
 ax.set_ylim(df['scale_factor'].min(), df['scale_factor'].max())
 
 # animation update function
 def update(frame):
-    current_time = time_only_df.iloc[frame]['time']
-    current_df = df[df['time'] <= current_time]
-    line.set_data(current_df['time'], current_df['scale_factor'])
-    return line,
+    return tuple(growing.show(frame_lengths[frame]))
 
 # create animation
 ani = animation.FuncAnimation(fig, update, frames=len(time_only_df), interval=20, blit=True)
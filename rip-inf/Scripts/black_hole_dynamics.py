@@ -0,0 +1,86 @@
+"""Black holes drifting towards, and latching onto, the crystal filaments.
+
+Every step each free hole moves one cell (in row and column) towards its
+nearest active filament cell and latches when it lands on one. The nearest
+cells of all free holes come from one batched cKDTree query (workers=-1) and
+the moves and latches are array operations, so a step costs the same
+handful of numpy calls for 30 or 30,000 holes. Positions, colours and pulse
+alphas are returned as arrays for drawing the whole population with two
+scatter artists (free holes; latched glows followed by their cores), and
+near_mask() turns "next to a latched hole" into a lookup in a dilated
+occupancy grid.
+"""
+import numpy as np
+from matplotlib.colors import to_rgba
+from scipy.ndimage import binary_dilation
+from scipy.spatial import cKDTree
+
+FREE_COLOR = to_rgba("aqua", 0.4)
+LATCHED_COLOR = to_rgba("lime", 0.9)
+PULSE_COLOR = to_rgba("lime")
+
+
+class BlackHoleSwarm:
+    """(row, col) positions of black holes on a rows x cols grid, with latch state."""
+
+    def __init__(self, positions, shape):
+        self.positions = np.array(positions, dtype=np.int64).reshape(-1, 2)
+        self.shape = np.asarray(shape)
+        self.stuck = np.zeros(len(self.positions), dtype=bool)
+        self.latch_frame = np.full(len(self.positions), -1, dtype=np.int64)
+
+    @classmethod
+    def at_frame(cls, positions, latch_frame, shape, frame):
+        """Swarm as recorded after frame: holes latched later than frame count as free."""
+        swarm = cls(positions, shape)
+        swarm.latch_frame = np.where(latch_frame <= frame, latch_frame, -1)
+        swarm.stuck = swarm.latch_frame >= 0
+        return swarm
+
+    def __len__(self):
+        return len(self.positions)
+
+    def step(self, grid, frame):
+        """Move every free hole one cell towards the nearest active cell of grid; latch those that land on one."""
+        cells = np.argwhere(grid)
+        free = np.flatnonzero(~self.stuck)
+        if not len(cells) or not len(free):
+            return
+        _, nearest = cKDTree(cells).query(self.positions[free], k=1, workers=-1)
+        moved = self.positions[free] + np.sign(cells[nearest] - self.positions[free])
+
+        inside = np.all((moved >= 0) & (moved < self.shape), axis=1)
+        free, moved = free[inside], moved[inside]
+        self.positions[free] = moved
+
+        latched = free[grid[moved[:, 0], moved[:, 1]]]
+        self.stuck[latched] = True
+        self.latch_frame[latched] = frame
+
+    @property
+    def latched(self):
+        """(n, 2) positions of the latched holes."""
+        return self.positions[self.stuck]
+
+    def near_mask(self, radius=1):
+        """Bool grid of the cells within radius (Chebyshev) of a latched hole."""
+        occupied = np.zeros(tuple(self.shape), dtype=bool)
+        latched = self.latched
+        occupied[latched[:, 0], latched[:, 1]] = True
+        if radius < 1 or not len(latched):
+            return occupied
+        return binary_dilation(occupied, np.ones((3, 3), dtype=bool), iterations=radius)
+
+    def colors(self):
+        """RGBA per hole: aqua for free, lime for latched."""
+        return np.where(self.stuck[:, None], LATCHED_COLOR, FREE_COLOR)
+
+    def pulse_alphas(self, frame):
+        """Alpha of the glow around each latched hole, pulsing with the frames since it latched."""
+        return 0.1 + 0.05 * np.sin(0.3 * (frame - self.latch_frame[self.stuck]))
+
+    def pulse_colors(self, frame):
+        """RGBA of the glow around each latched hole: lime with pulse_alphas(frame)."""
+        colors = np.tile(PULSE_COLOR, (int(self.stuck.sum()), 1))
+        colors[:, 3] = self.pulse_alphas(frame)
+        return colors
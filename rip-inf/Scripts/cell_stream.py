@@ -0,0 +1,62 @@
+"""Streaming, bounded-memory reader for cell CSVs (inflation/structure/post.csv.gz).
+
+The file is parsed in fixed-size chunks and the column and row predicates are
+applied inside the parse loop, so peak memory is bounded by the chunk size
+and the number of matching rows rather than by grid_size^3 x timesteps.
+"""
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 500_000
+
+
+def _header(csv_path):
+    return list(pd.read_csv(csv_path, nrows=0).columns)
+
+
+def iter_cells(csv_path, columns=None, timesteps=None, layers=None, min_density=None,
+               density_column="matter_density_smoothed", ordered=False, chunk_rows=CHUNK_ROWS):
+    """Yield DataFrame chunks of csv_path holding only the matching rows and requested columns.
+
+    timesteps / layers: iterables of values to keep (None keeps all).
+    min_density: keep rows with density_column >= min_density.
+    ordered: rows are grouped by ascending timestep (true for every file rip-inf and
+    rip-post write), which lets the reader stop after the last requested timestep.
+    """
+    header = _header(csv_path)
+    columns = list(columns) if columns is not None else [c for c in header if c != "neighbors"]
+    timesteps = None if timesteps is None else np.unique(np.fromiter(timesteps, dtype=np.int64))
+    layers = None if layers is None else np.unique(np.fromiter(layers, dtype=np.int64))
+
+    needed = list(columns)
+    if timesteps is not None:
+        needed.append("timestep")
+    if layers is not None:
+        needed.append("layer")
+    if min_density is not None:
+        needed.append(density_column)
+    needed = [c for c in header if c in set(needed)]
+
+    last_timestep = timesteps[-1] if timesteps is not None and len(timesteps) else None
+    for chunk in pd.read_csv(csv_path, usecols=needed, chunksize=chunk_rows):
+        keep = np.ones(len(chunk), dtype=bool)
+        if timesteps is not None:
+            keep &= np.isin(chunk["timestep"].to_numpy(), timesteps)
+        if layers is not None:
+            keep &= np.isin(chunk["layer"].to_numpy(), layers)
+        if min_density is not None:
+            keep &= chunk[density_column].to_numpy() >= min_density
+
+        if keep.any():
+            yield chunk.loc[keep, columns].reset_index(drop=True)
+        if ordered and last_timestep is not None and chunk["timestep"].iloc[-1] > last_timestep:
+            break
+
+
+def read_cells(csv_path, **filters):
+    """Concatenate the chunks of iter_cells() into one DataFrame."""
+    chunks = list(iter_cells(csv_path, **filters))
+    if not chunks:
+        columns = filters.get("columns") or [c for c in _header(csv_path) if c != "neighbors"]
+        return pd.DataFrame(columns=list(columns))
+    return pd.concat(chunks, ignore_index=True)
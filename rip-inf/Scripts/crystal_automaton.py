@@ -0,0 +1,61 @@
+"""Vectorized cellular automaton behind the synthetic crystal-growth animation.
+
+An inactive cell becomes active with probability grow_chance when it has
+between min_neighbors and max_neighbors active 8-neighbours. Neighbour
+counts are eight shifted sums of the zero-padded grid and the growth rule
+uses one random draw for the whole grid per step, so a step is a handful of
+array operations at any grid size. The gravity map is the static
+gravity_seed plus gravity_step on every active cell, computed in bulk when
+it is needed instead of being stored per step. All randomness comes from one
+numpy Generator, so a seed reproduces the run.
+"""
+import numpy as np
+
+NEIGHBOR_OFFSETS = [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+
+
+def neighbor_counts(active):
+    """Number of active 8-neighbours of every cell; cells outside the grid count as inactive."""
+    rows, cols = active.shape
+    padded = np.pad(active, 1).astype(np.uint8)
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for dr, dc in NEIGHBOR_OFFSETS:
+        counts += padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+    return counts
+
+
+class CrystalAutomaton:
+    """Crystal growth on a rows x cols grid from seed_points, advanced with step()."""
+
+    def __init__(self, shape, seed_points, grow_chance=0.5, gravity_seed=None, gravity_step=0.01,
+                 min_neighbors=1, max_neighbors=3, rng=None):
+        self.shape = tuple(shape)
+        self.grow_chance = grow_chance
+        self.min_neighbors = min_neighbors
+        self.max_neighbors = max_neighbors
+        self.rng = rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+        self.gravity_seed = np.zeros(self.shape) if gravity_seed is None else np.asarray(gravity_seed)
+        self.gravity_step = gravity_step
+        self.active = np.zeros(self.shape, dtype=bool)
+        for r, c in seed_points:
+            self.active[r, c] = True
+
+    def step(self):
+        """Grow by one timestep; returns the (updated in place) active grid."""
+        counts = neighbor_counts(self.active)
+        grow = ((counts >= self.min_neighbors) & (counts <= self.max_neighbors)
+                & (self.rng.random(self.shape) < self.grow_chance))
+        self.active |= grow
+        return self.active
+
+    def run(self, timesteps):
+        """(timesteps, rows, cols) bool history of the grid after each step."""
+        history = np.empty((timesteps,) + self.shape, dtype=bool)
+        for t in range(timesteps):
+            history[t] = self.step()
+        return history
+
+    def gravity(self, active=None):
+        """Gravity map for an active grid (default: the current one)."""
+        active = self.active if active is None else active
+        return self.gravity_seed + self.gravity_step * active
@@ -0,0 +1,104 @@
+"""Simulated state of the synthetic crystal-growth animation, stored once and rendered any number of times.
+
+simulate_crystal() runs the automaton and the black-hole swarm for every
+frame up front and returns a CrystalState: the occupancy grid per frame,
+every hole's position per frame, the frame each hole latched, and the static
+gravity seed from which each frame's gravity map follows. save() writes it to
+a compressed .npz (occupancy as packed bits, positions in the smallest
+integer type) together with the settings and STATE_VERSION that produced
+it, and load_or_simulate() reuses that file only while both match.
+Rendering only reads this state, so changing colours or FPS, or rendering
+frames in parallel, never reruns the simulation.
+"""
+import json
+import os
+
+import numpy as np
+from crystal_automaton import CrystalAutomaton
+from black_hole_dynamics import BlackHoleSwarm
+
+STATE_VERSION = 1
+
+
+class CrystalState:
+    """Per-frame occupancy and black holes of one crystal-growth run."""
+
+    def __init__(self, occupancy, positions, latch_frame, gravity_seed, gravity_step, config):
+        self.occupancy = occupancy          # (frames, rows, cols) bool
+        self.positions = positions          # (frames, holes, 2) row, col after each frame
+        self.latch_frame = latch_frame      # (holes,) frame each hole latched, -1 if never
+        self.gravity_seed = gravity_seed    # (rows, cols)
+        self.gravity_step = gravity_step
+        self.config = config
+
+    def __len__(self):
+        return len(self.occupancy)
+
+    @property
+    def shape(self):
+        return self.occupancy.shape[1:]
+
+    def gravity(self, frame):
+        """Gravity map of one frame: the seed plus gravity_step on every active cell."""
+        return self.gravity_seed + self.gravity_step * self.occupancy[frame]
+
+    def swarm(self, frame):
+        """The black holes as they were after frame."""
+        return BlackHoleSwarm.at_frame(self.positions[frame], self.latch_frame, self.shape, frame)
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, occupancy=np.packbits(self.occupancy, axis=-1), cols=self.shape[1],
+                            positions=self.positions, latch_frame=self.latch_frame,
+                            gravity_seed=self.gravity_seed, gravity_step=self.gravity_step,
+                            config=json.dumps(self.config))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            occupancy = np.unpackbits(f["occupancy"], axis=-1, count=int(f["cols"])).astype(bool)
+            config = json.loads(str(f["config"]))
+            return cls(occupancy, f["positions"], f["latch_frame"], f["gravity_seed"],
+                       float(f["gravity_step"]), config)
+
+
+def crystal_config(rows, cols, timesteps, seed_points, grow_chance, bh_count, seed, gravity_scale=0.08):
+    """Every setting of a run, defaults included, plus STATE_VERSION, in the JSON form stored with the state."""
+    return dict(version=STATE_VERSION, rows=rows, cols=cols, timesteps=timesteps,
+                seed_points=[list(p) for p in seed_points], grow_chance=grow_chance, bh_count=bh_count,
+                seed=seed, gravity_scale=gravity_scale)
+
+
+def simulate_crystal(rows, cols, timesteps, seed_points, grow_chance, bh_count, seed, gravity_scale=0.08):
+    """Run the automaton and the black holes for timesteps frames, all randomness drawn from seed."""
+    config = crystal_config(rows, cols, timesteps, seed_points, grow_chance, bh_count, seed, gravity_scale)
+    rng = np.random.default_rng(seed)
+    swarm = BlackHoleSwarm(rng.integers(0, rows, size=(bh_count, 2)), (rows, cols))
+    gravity_seed = rng.random((rows, cols)) * gravity_scale  # mock gravity_well
+    automaton = CrystalAutomaton((rows, cols), seed_points, grow_chance, gravity_seed, rng=rng)
+    occupancy = automaton.run(timesteps)
+
+    positions = np.empty((timesteps, bh_count, 2), dtype=np.min_scalar_type(-max(rows, cols)))
+    for frame in range(timesteps):
+        swarm.step(occupancy[frame], frame)
+        positions[frame] = swarm.positions
+    return CrystalState(occupancy, positions, swarm.latch_frame, gravity_seed, automaton.gravity_step, config)
+
+
+def load_or_simulate(path, **config):
+    """The state saved at path if it has the same STATE_VERSION and settings, else a fresh simulation (saved there).
+
+    Bump STATE_VERSION whenever crystal_automaton or black_hole_dynamics change what a run produces.
+    """
+    if os.path.exists(path):
+        state = CrystalState.load(path)
+        if state.config == crystal_config(**config):
+            print(f"Loaded simulation state from {path}")
+            return state
+        print(f"{path} was made with other settings or an older version; simulating again")
+    state = simulate_crystal(**config)
+    state.save(path)
+    print(f"Saved simulation state to {path}")
+    return state
@@ -0,0 +1,30 @@
+"""Array-backed first-seen timestamps for filament segments.
+
+Every possible segment of a rows x cols slice is addressed by (direction,
+cell) as in filament_edges.neighbor_edge_masks(), so the whole history is a
+single (4, rows, cols) integer array updated with one vectorized minimum per
+frame. Segments and their ages come back as NumPy arrays in matching order.
+"""
+import numpy as np
+
+from filament_edges import neighbor_edge_masks, segments_from_masks
+
+NEVER = np.iinfo(np.int32).max
+
+
+class EdgeAgeStore:
+    def __init__(self, rows, cols):
+        self.first_seen = np.full((4, rows, cols), NEVER, dtype=np.int32)
+
+    def update(self, occupancy, t):
+        """Record timestep t for every segment present in occupancy (earlier sightings win)."""
+        seen = np.where(neighbor_edge_masks(occupancy), np.int32(t), np.int32(NEVER))
+        np.minimum(self.first_seen, seen, out=self.first_seen)
+
+    def edges(self, t):
+        """Segments first seen at or before t as an (N, 2, 2) array, plus their ages (t - first seen)."""
+        mask = self.first_seen <= t
+        return segments_from_masks(mask), t - self.first_seen[mask]
+
+    def __len__(self):
+        return int(np.count_nonzero(self.first_seen != NEVER))
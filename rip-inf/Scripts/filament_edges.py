@@ -0,0 +1,38 @@
+"""Vectorized filament segment extraction on 2D occupancy slices.
+
+Two occupied cells are joined by a segment when they are 8-neighbours. Only
+the 4 "forward" directions are checked, so each segment appears exactly once
+and no sorting/dedup pass is needed.
+"""
+import numpy as np
+
+# (dr, dc) of the 4 unique 8-neighbour directions; the other 4 are their reverses
+NEIGHBOR_OFFSETS = ((0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def neighbor_edge_masks(occupancy):
+    """(4, rows, cols) bool: mask[d, r, c] is True when (r, c) and (r + dr, c + dc) are both occupied."""
+    occupancy = np.asarray(occupancy, dtype=bool)
+    rows, cols = occupancy.shape
+    padded = np.pad(occupancy, 1)
+    masks = np.empty((len(NEIGHBOR_OFFSETS), rows, cols), dtype=bool)
+    for d, (dr, dc) in enumerate(NEIGHBOR_OFFSETS):
+        np.logical_and(occupancy, padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols], out=masks[d])
+    return masks
+
+
+def segments_from_masks(masks):
+    """(N, 2, 2) segments [(c, r), (nc, nr)] for every True entry of an edge mask stack."""
+    d, r, c = np.nonzero(masks)
+    offsets = np.asarray(NEIGHBOR_OFFSETS)[d]
+    segments = np.empty((len(d), 2, 2), dtype=np.float64)
+    segments[:, 0, 0] = c
+    segments[:, 0, 1] = r
+    segments[:, 1, 0] = c + offsets[:, 1]
+    segments[:, 1, 1] = r + offsets[:, 0]
+    return segments
+
+
+def neighbor_segments(occupancy):
+    """Deduplicated (N, 2, 2) segments between occupied 8-neighbours, usable directly by LineCollection."""
+    return segments_from_masks(neighbor_edge_masks(occupancy))
@@ -0,0 +1,50 @@
+"""Filament segments of the last tail_length grids, maintained incrementally.
+
+FilamentTail keeps a ring buffer of the (4, rows, cols) edge masks of the
+last tail_length grids (see filament_edges.neighbor_edge_masks) and a
+running count of how many of them contain each segment. Each new grid's
+masks are computed once, when it enters the buffer; the mask it replaces is
+subtracted from the count. A frame's segments and their multiplicities then
+come from the count array alone, whatever the tail length.
+"""
+import numpy as np
+
+from filament_edges import neighbor_edge_masks, segments_from_masks
+
+
+class FilamentTail:
+    """Segments of the last tail_length grids of a (frames, rows, cols) history, advanced frame by frame."""
+
+    def __init__(self, history, tail_length):
+        self.history = history
+        self.tail_length = tail_length
+        rows, cols = history.shape[1:]
+        self.masks = np.zeros((tail_length, 4, rows, cols), dtype=bool)
+        self.counts = np.zeros((4, rows, cols), dtype=np.uint8)
+        self.frame = -1
+
+    def _push(self, frame):
+        slot = frame % self.tail_length
+        self.counts -= self.masks[slot]
+        self.masks[slot] = neighbor_edge_masks(self.history[frame])
+        self.counts += self.masks[slot]
+        self.frame = frame
+
+    def at(self, frame):
+        """(N, 2, 2) segments present in any of grids frame - tail_length + 1 .. frame, and in how many of them."""
+        if frame != self.frame:
+            if frame != self.frame + 1:
+                # jumped (or went back): refill the buffer from the history
+                self.masks[:] = False
+                self.counts[:] = 0
+                for f in range(max(0, frame - self.tail_length + 1), frame):
+                    self._push(f)
+            self._push(frame)
+        present = self.counts > 0
+        return segments_from_masks(present), self.counts[present]
+
+
+def touches(segments, cell_mask):
+    """True for segments with either end on a True cell of cell_mask (indexed [row, col])."""
+    ends = segments.astype(np.intp)
+    return cell_mask[ends[:, 0, 1], ends[:, 0, 0]] | cell_mask[ends[:, 1, 1], ends[:, 1, 0]]
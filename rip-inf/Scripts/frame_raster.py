@@ -0,0 +1,111 @@
+"""Direct-to-array rasterizer for 2D slice animations.
+
+Colormapped slices, black-hole dots and neighbour segments are written
+straight into a uint8 RGB frame buffer with NumPy, so frames can go to the
+GIF/MP4 encoder (parallel_render.write_frames) without drawing a matplotlib
+figure. Each grid cell becomes a scale x scale block of pixels. caption()
+writes a title over the top of the finished frame with Pillow.
+"""
+import numpy as np
+from matplotlib import colormaps
+
+
+def colormap_lut(cmap, n=256):
+    """(n, 3) uint8 lookup table of a matplotlib colormap."""
+    cmap = colormaps[cmap] if isinstance(cmap, str) else cmap
+    return (cmap(np.linspace(0.0, 1.0, n))[:, :3] * 255).round().astype(np.uint8)
+
+
+def colorize(values, cmap, vmin, vmax):
+    """Map a 2D array to (H, W, 3) uint8 colours the way imshow(vmin=, vmax=) would."""
+    lut = colormap_lut(cmap)
+    scaled = (np.asarray(values, dtype=np.float64) - vmin) / ((vmax - vmin) or 1.0)
+    index = np.clip((scaled * len(lut)).astype(np.int64), 0, len(lut) - 1)
+    return lut[index]
+
+
+def _rgb(color):
+    from matplotlib.colors import to_rgb
+    return (np.asarray(to_rgb(color)) * 255).round()
+
+
+class Raster:
+    """uint8 RGB frame of a rows x cols cell grid; origin='lower' puts row 0 at the bottom like imshow."""
+
+    def __init__(self, rows, cols, scale=1, origin="upper", background="black"):
+        self.rows, self.cols, self.scale, self.origin = rows, cols, scale, origin
+        self.background = _rgb(background).astype(np.uint8)
+        self.image = np.empty((rows * scale, cols * scale, 3), dtype=np.uint8)
+        self.clear()
+
+    def clear(self):
+        self.image[:] = self.background
+        return self
+
+    def _pixels(self, rows, cols):
+        """Pixel (y, x) of the centre of cells (rows, cols); accepts fractional cell coordinates."""
+        rows = np.asarray(rows, dtype=np.float64)
+        if self.origin == "lower":
+            rows = self.rows - 1 - rows
+        y = np.floor(rows * self.scale + self.scale / 2).astype(np.int64)
+        x = np.floor(np.asarray(cols, dtype=np.float64) * self.scale + self.scale / 2).astype(np.int64)
+        keep = (y >= 0) & (y < self.image.shape[0]) & (x >= 0) & (x < self.image.shape[1])
+        return y[keep], x[keep]
+
+    def _blend(self, y, x, rgb, alpha):
+        if alpha >= 1.0:
+            self.image[y, x] = rgb
+        else:
+            self.image[y, x] = (self.image[y, x] * (1.0 - alpha) + rgb * alpha).round().astype(np.uint8)
+
+    def slice(self, values, cmap, vmin, vmax, alpha=1.0):
+        """Draw a (rows, cols) array through a colormap, blended with the current frame."""
+        rgb = colorize(values, cmap, vmin, vmax)
+        if self.origin == "lower":
+            rgb = rgb[::-1]
+        if self.scale > 1:
+            rgb = rgb.repeat(self.scale, axis=0).repeat(self.scale, axis=1)
+        if alpha >= 1.0:
+            self.image[:] = rgb
+        else:
+            self.image[:] = (self.image * (1.0 - alpha) + rgb * alpha).round().astype(np.uint8)
+        return self
+
+    def points(self, rows, cols, color, radius=0, alpha=1.0):
+        """Draw square dots of (2 * radius + 1) pixels at cell centres."""
+        y, x = self._pixels(rows, cols)
+        offsets = np.arange(-radius, radius + 1)
+        y = (y[:, None, None] + offsets[None, :, None]).repeat(len(offsets), axis=2).ravel()
+        x = (x[:, None, None] + offsets[None, None, :]).repeat(len(offsets), axis=1).ravel()
+        keep = (y >= 0) & (y < self.image.shape[0]) & (x >= 0) & (x < self.image.shape[1])
+        self._blend(y[keep], x[keep], _rgb(color), alpha)
+        return self
+
+    def caption(self, text, color="white", size=None):
+        """Write text centred along the top of the frame, outlined in the background colour; call it last."""
+        from PIL import Image, ImageDraw, ImageFont
+        size = size or max(10, 2 * self.scale + 4)
+        try:
+            font = ImageFont.load_default(size=size)
+        except TypeError:
+            font = ImageFont.load_default()  # Pillow < 10.1: fixed-size bitmap font
+        image = Image.fromarray(self.image)
+        draw = ImageDraw.Draw(image)
+        x = (image.width - draw.textlength(text, font=font)) / 2
+        draw.text((x, size // 2), text, font=font, fill=tuple(int(v) for v in _rgb(color)),
+                  stroke_width=max(1, size // 8), stroke_fill=tuple(int(v) for v in self.background))
+        self.image[:] = np.asarray(image)
+        return self
+
+    def segments(self, segments, color, alpha=1.0):
+        """Draw (N, 2, 2) [(c, r), (nc, nr)] segments, e.g. from filament_edges.neighbor_segments()."""
+        segments = np.asarray(segments, dtype=np.float64).reshape(-1, 2, 2)
+        if not len(segments):
+            return self
+        length = np.abs(segments[:, 1] - segments[:, 0]).max() * self.scale
+        steps = np.linspace(0.0, 1.0, int(np.ceil(length)) + 1)
+        # sample every segment at one point per pixel of its longest axis
+        points = segments[:, :1] + (segments[:, 1:] - segments[:, :1]) * steps[None, :, None]
+        y, x = self._pixels(points[..., 1].ravel(), points[..., 0].ravel())
+        self._blend(y, x, _rgb(color), alpha)
+        return self
@@ -1,18 +1,13 @@
-import pandas as pd
 import numpy as np
-import gzip
 from scipy.ndimage import gaussian_filter
 import matplotlib.pyplot as plt
+from inflation_cache import open_cache
+from cell_volume import read_volume
 
-# Load the CSV
-with gzip.open("../data/inflation.csv.gz", "rt") as f:
-	df = pd.read_csv(f)
-
-# Create 3D grid of matter_density
-grid_size = 64
-density_grid = np.zeros((grid_size, grid_size, grid_size), dtype=np.float32)
-for _, row in df[df["timestep"] == 99].iterrows():
-	density_grid[int(row["col"]), int(row["row"]), int(row["layer"])] = row["matter_density"]
+# Load the 3D grid of matter_density at the last timestep
+cache = open_cache("../data/inflation.csv.gz")
+density_grid = read_volume(cache, "matter_density", timesteps=cache.timesteps[-1])[0]
+grid_size = density_grid.shape[2]
 
 # Apply Gaussian smoothing
 smoothed = gaussian_filter(density_grid, sigma=1.2)
@@ -20,5 +15,5 @@ smoothed = gaussian_filter(density_grid, sigma=1.2)
 # Plot middle Z slice
 plt.imshow(smoothed[:, :, grid_size // 2], cmap="inferno")
 plt.colorbar(label="Smoothed Density")
-plt.title("2D Slice of Smoothed Density (Z=32)")
+plt.title(f"2D Slice of Smoothed Density (Z={grid_size // 2})")
 plt.show()
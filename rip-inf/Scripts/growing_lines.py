@@ -0,0 +1,43 @@
+"""Line plots that grow over the course of an animation.
+
+GrowingLines keeps the x values and every line's y values once, as
+contiguous float arrays sorted by x. A frame only hands each Line2D a view
+of the first n points, so the per-frame data handling no longer depends on
+how far the animation has got (no re-slicing, filtering or concatenating of
+the table every frame). prefix_lengths() turns frame times into those n
+with one searchsorted call, up front.
+
+Used by the rip-de summary animation and scripts/create_combined_animation.py
+too; they add this folder to sys.path.
+"""
+import numpy as np
+
+
+class GrowingLines:
+    """Lines sharing one x axis that show the first n points of precomputed arrays."""
+
+    def __init__(self, lines, x, ys, sort=True):
+        x = np.asarray(x, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64).reshape(-1, len(x))
+        if len(ys) != len(lines):
+            raise ValueError(f"{len(lines)} lines but {len(ys)} y series")
+        if sort:
+            order = np.argsort(x, kind="stable")
+            x, ys = x[order], ys[:, order]
+        self.lines = list(lines)
+        self.x = np.ascontiguousarray(x)
+        self.ys = np.ascontiguousarray(ys)
+
+    def __len__(self):
+        return len(self.x)
+
+    def prefix_lengths(self, stops):
+        """Number of points with x <= each stop."""
+        return np.searchsorted(self.x, stops, side="right")
+
+    def show(self, n):
+        """Draw the first n points of every line; returns the lines (for blitting)."""
+        x = self.x[:n]
+        for line, y in zip(self.lines, self.ys):
+            line.set_data(x, y[:n])
+        return self.lines
@@ -0,0 +1,196 @@
+"""Columnar, memory-mapped cache for the cell CSVs written by rip-inf.
+
+The first open converts e.g. ../data/inflation.csv.gz into one raw typed
+array per column plus a timestep -> row-offset index. Later opens only
+memory-map those files, so reading a single timestep touches that timestep's
+rows instead of decompressing and parsing the whole CSV. The cache lives next
+to the source (inflation.csv.gz.cache/) and is rebuilt automatically when the
+source file's size or mtime changes.
+"""
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 1
+CHUNK_ROWS = 1_000_000
+
+# on-disk dtype for every known Cell column; unknown columns fall back to float64
+COLUMN_DTYPES = {
+    "timestep": "int32",
+    "col": "int16",
+    "row": "int16",
+    "layer": "int16",
+    "rip_strength": "float32",
+    "curvature": "float32",
+    "matter_density": "float32",
+    "matter_density_smoothed": "float32",
+    "is_black_hole": "uint8",
+    "black_hole_id": "int64",
+    "gravity_well": "float32",
+}
+SKIP_COLUMNS = {"neighbors"}
+
+
+def default_cache_dir(csv_path):
+    return str(csv_path) + ".cache"
+
+
+def _source_signature(csv_path):
+    st = os.stat(csv_path)
+    return {"source_size": st.st_size, "source_mtime_ns": st.st_mtime_ns}
+
+
+def _read_meta(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, "meta.json")) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _to_column_array(series, dtype):
+    """Convert one parsed CSV column to its cache dtype (serde writes bools as true/false, None as empty)."""
+    if series.dtype == object:
+        lowered = series.astype(str).str.strip().str.lower()
+        if dtype == "uint8":
+            return lowered.isin(("1", "true")).to_numpy(dtype=np.uint8)
+        series = pd.to_numeric(lowered.replace({"true": "1", "false": "0"}), errors="coerce")
+    return series.fillna(0).to_numpy().astype(dtype, copy=False)
+
+
+def build_cache(csv_path, cache_dir=None, chunk_rows=CHUNK_ROWS):
+    """Convert csv_path into a columnar cache. Rows must be grouped by timestep, as rip-inf writes them."""
+    cache_dir = cache_dir or default_cache_dir(csv_path)
+    signature = _source_signature(csv_path)
+
+    if os.path.isdir(cache_dir):
+        shutil.rmtree(cache_dir)
+    os.makedirs(cache_dir)
+
+    files = {}
+    dtypes = {}
+    stats = {}
+    timesteps = []
+    offsets = []
+    n_rows = 0
+    last_timestep = None
+
+    print(f"Building column cache for {csv_path}...")
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_rows):
+            if not files:
+                for name in chunk.columns:
+                    if name in SKIP_COLUMNS:
+                        continue
+                    dtypes[name] = COLUMN_DTYPES.get(name, "float64")
+                    files[name] = open(os.path.join(cache_dir, f"{name}.bin"), "wb")
+
+            for name, f in files.items():
+                values = _to_column_array(chunk[name], dtypes[name])
+                values.tofile(f)
+                if len(values):
+                    lo, hi = values.min().item(), values.max().item()
+                    if name in stats:
+                        lo, hi = min(lo, stats[name][0]), max(hi, stats[name][1])
+                    stats[name] = [lo, hi]
+
+            ts = chunk["timestep"].to_numpy()
+            if len(ts) == 0:
+                continue
+            if np.any(np.diff(ts) < 0) or (last_timestep is not None and ts[0] < last_timestep):
+                raise ValueError(f"{csv_path}: rows are not grouped by ascending timestep")
+            starts = np.flatnonzero(np.diff(ts)) + 1
+            if last_timestep is None or ts[0] != last_timestep:
+                starts = np.concatenate(([0], starts))
+            timesteps.extend(int(t) for t in ts[starts])
+            offsets.extend(int(s) + n_rows for s in starts)
+            last_timestep = ts[-1]
+            n_rows += len(ts)
+    finally:
+        for f in files.values():
+            f.close()
+
+    offsets.append(n_rows)
+    np.save(os.path.join(cache_dir, "timesteps.npy"), np.asarray(timesteps, dtype=np.int64))
+    np.save(os.path.join(cache_dir, "offsets.npy"), np.asarray(offsets, dtype=np.int64))
+
+    # meta.json is written last and marks the cache as complete
+    meta = dict(signature, version=CACHE_VERSION, rows=n_rows, columns=dtypes,
+                stats={name: {"min": lo, "max": hi} for name, (lo, hi) in stats.items()})
+    with open(os.path.join(cache_dir, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    print(f"Cached {n_rows} rows, {len(timesteps)} timesteps in {cache_dir}")
+    return meta
+
+
+class InflationCache:
+    """Read-only view over a built cache; columns are memory-mapped on first use."""
+
+    def __init__(self, cache_dir, meta):
+        self.cache_dir = cache_dir
+        self.meta = meta
+        self.rows = meta["rows"]
+        self.columns = list(meta["columns"])
+        self.timesteps = np.load(os.path.join(cache_dir, "timesteps.npy"))
+        self.offsets = np.load(os.path.join(cache_dir, "offsets.npy"))
+        self._mapped = {}
+
+    def column(self, name):
+        """Whole column as a read-only memmap (no data is read until it is indexed)."""
+        if name not in self._mapped:
+            if name not in self.meta["columns"]:
+                raise KeyError(f"column {name!r} not in cache (have {self.columns})")
+            dtype = np.dtype(self.meta["columns"][name])
+            if self.rows == 0:
+                self._mapped[name] = np.empty(0, dtype=dtype)
+            else:
+                path = os.path.join(self.cache_dir, f"{name}.bin")
+                self._mapped[name] = np.memmap(path, dtype=dtype, mode="r", shape=(self.rows,))
+        return self._mapped[name]
+
+    def min(self, name):
+        return self.meta["stats"][name]["min"]
+
+    def max(self, name):
+        return self.meta["stats"][name]["max"]
+
+    @property
+    def grid_shape(self):
+        """(cols, rows, layers) of the simulation grid."""
+        return tuple(int(self.max(name)) + 1 for name in ("col", "row", "layer"))
+
+    def row_range(self, timestep):
+        """Slice of rows belonging to a single timestep."""
+        i = np.searchsorted(self.timesteps, timestep)
+        if i == len(self.timesteps) or self.timesteps[i] != timestep:
+            raise KeyError(f"timestep {timestep} not in cache")
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def timestep(self, timestep, columns=None):
+        """DataFrame with the rows of one timestep; only the requested columns are touched."""
+        rows = self.row_range(timestep)
+        columns = columns or self.columns
+        return pd.DataFrame({name: np.asarray(self.column(name)[rows]) for name in columns})
+
+    def frame(self, columns=None):
+        """DataFrame over all timesteps for the requested columns."""
+        columns = columns or self.columns
+        return pd.DataFrame({name: np.asarray(self.column(name)) for name in columns})
+
+
+def open_cache(csv_path, cache_dir=None):
+    """Open the cache for csv_path, (re)building it if missing or stale."""
+    cache_dir = cache_dir or default_cache_dir(csv_path)
+    meta = _read_meta(cache_dir)
+    signature = _source_signature(csv_path)
+    if (meta is None or meta.get("version") != CACHE_VERSION
+            or any(meta.get(key) != value for key, value in signature.items())):
+        meta = build_cache(csv_path, cache_dir)
+    return InflationCache(cache_dir, meta)
+
+
+if __name__ == "__main__":
+    open_cache("../data/inflation.csv.gz")
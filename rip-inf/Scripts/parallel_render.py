@@ -0,0 +1,114 @@
+"""Parallel frame rendering for GIF/MP4 animations.
+
+render_animation() splits the frame indices across a process pool. Every
+worker builds its own figure once via setup(), draws its frames with draw()
+and returns them as raw RGBA buffers. Frames come back in order and are
+streamed to the Pillow (GIF) or ffmpeg (everything else) encoder.
+
+setup and draw must be module-level functions so they can be sent to
+workers, and scripts using this must keep their main code under
+`if __name__ == "__main__":` (worker processes re-import the script on
+Windows). The default number of workers is $RIP_WORKERS if set (the
+pipeline runner sets it to each target's share of the cores), else the CPU
+count.
+"""
+import os
+import subprocess
+from multiprocessing import Pool
+
+import numpy as np
+
+_worker = None
+
+
+def _init_worker(setup, draw, setup_args):
+    global _worker
+    import matplotlib
+    matplotlib.use("Agg")
+    fig, context = setup(*setup_args)
+    _worker = (fig, context, draw)
+
+
+def _render(frame):
+    fig, context, draw = _worker
+    draw(context, frame)
+    fig.canvas.draw()
+    return np.asarray(fig.canvas.buffer_rgba()).copy()
+
+
+def write_frames(images, output_path, fps, bitrate=1800, metadata=None):
+    """Encode an iterable of (H, W, 3|4) uint8 frames; .gif goes through Pillow, anything else through ffmpeg.
+
+    Returns the number of frames written; raises ValueError if there are none.
+    """
+    if str(output_path).lower().endswith(".gif"):
+        from PIL import Image
+        images = iter(images)
+        first = next(images, None)
+        if first is None:
+            raise ValueError("no frames to write")
+        count = 1
+
+        def rest():
+            nonlocal count
+            for image in images:
+                count += 1
+                yield Image.fromarray(image)
+
+        # Pillow pulls append_images lazily, so frames stream to the file in order
+        Image.fromarray(first).save(output_path, save_all=True, append_images=rest(),
+                                    duration=int(1000 / fps), loop=0)
+        return count
+
+    from matplotlib import rcParams
+    proc = None
+    count = 0
+    try:
+        for image in images:
+            if proc is None:
+                height, width, depth = image.shape
+                cmd = [rcParams["animation.ffmpeg_path"], "-y", "-loglevel", "error",
+                       "-f", "rawvideo", "-vcodec", "rawvideo",
+                       "-s", f"{width}x{height}", "-pix_fmt", "rgba" if depth == 4 else "rgb24",
+                       "-r", str(fps), "-i", "-",
+                       "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+                       "-vcodec", "h264", "-pix_fmt", "yuv420p", "-b:v", f"{bitrate}k"]
+                for key, value in (metadata or {}).items():
+                    cmd += ["-metadata", f"{key}={value}"]
+                proc = subprocess.Popen(cmd + [str(output_path)], stdin=subprocess.PIPE)
+            proc.stdin.write(np.ascontiguousarray(image).tobytes())
+            count += 1
+    finally:
+        if proc is not None:
+            proc.stdin.close()
+            if proc.wait() != 0:
+                raise RuntimeError(f"ffmpeg failed writing {output_path}")
+    if not count:
+        raise ValueError("no frames to write")
+    return count
+
+
+def render_frames(setup, draw, frames, setup_args=(), workers=None, chunksize=4):
+    """Yield the RGBA buffer of every frame, in order, rendered by `workers` processes."""
+    frames = list(frames)
+    workers = min(workers or int(os.environ.get("RIP_WORKERS", 0)) or os.cpu_count() or 1, len(frames))
+    if workers <= 1:
+        _init_worker(setup, draw, setup_args)
+        for frame in frames:
+            yield _render(frame)
+        return
+
+    with Pool(workers, initializer=_init_worker, initargs=(setup, draw, setup_args)) as pool:
+        yield from pool.imap(_render, frames, chunksize=chunksize)
+
+
+def render_animation(setup, draw, frames, output_path, fps, setup_args=(), workers=None,
+                     chunksize=4, bitrate=1800, metadata=None):
+    """Render frames in parallel and encode them to output_path.
+
+    setup(*setup_args) -> (fig, context) is called once per worker;
+    draw(context, frame) updates that worker's figure for one frame.
+    """
+    images = render_frames(setup, draw, frames, setup_args, workers, chunksize)
+    count = write_frames(images, output_path, fps, bitrate, metadata)
+    print(f"Rendered {count} frames to {output_path}")
@@ -0,0 +1,37 @@
+"""Generate the static rip-inf plots from one opened inflation cache.
+
+open_cache() runs once and the same InflationCache is handed to every plot
+function, so inflation.csv.gz is decompressed at most once (when the cache
+is stale) per pipeline run. The per-timestep summary table is loaded (or
+rebuilt) once as well.
+"""
+import time
+import matplotlib.pyplot as plt
+from pathlib import Path
+from inflation_cache import open_cache
+from timestep_summary import timestep_summary
+from plot_slice import plot_slice
+from plot_bh_vs_rs import plot_bh_vs_rs
+from plot_isosurface import plot_isosurface
+from filament_graph import filament_components
+
+
+def plot_all(csv_path="../data/inflation.csv.gz", assets_path="../assets", data_path="../data"):
+    start = time.perf_counter()
+    cache = open_cache(csv_path)
+    print(f"Opened {csv_path} cache in {time.perf_counter() - start:.2f}s")
+
+    assets_path, data_path = Path(assets_path).resolve(), Path(data_path)
+    summary = timestep_summary(cache, data_path / "inflation_summary.csv")
+    plot_slice(cache, assets_path / "curvature_multi_slice.png", summary)
+    plot_bh_vs_rs(summary, assets_path / "black_holes_vs_rip_strength.png")
+    plt.close("all")
+    plot_isosurface(cache, assets_path)
+
+    _, components = filament_components(cache)
+    components.to_csv(data_path / "filament_components.csv", index=False)
+    print(f"Saved {len(components)} components to {data_path / 'filament_components.csv'}")
+
+
+if __name__ == "__main__":
+    plot_all()
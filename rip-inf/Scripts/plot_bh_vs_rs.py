@@ -1,23 +1,17 @@
-import pandas as pd
-import gzip
 import matplotlib.pyplot as plt
+from inflation_cache import open_cache
+from timestep_summary import timestep_summary
 
-# Load data
-with gzip.open("../data/inflation.csv.gz", "rt") as f:
-	df = pd.read_csv(f)
+def plot_bh_vs_rs(summary, output_file="../assets/black_holes_vs_rip_strength.png"):
+    # One row per timestep: rip strength and black-hole count (see timestep_summary.py)
+    plt.figure(figsize=(10, 6))
+    plt.plot(summary["rip_strength"], summary["black_holes"], marker="o")
+    plt.xlabel("Rip Strength")
+    plt.ylabel("Number of Black Holes")
+    plt.title("Black Holes vs. Rip Strength")
+    plt.grid(True)
+    plt.tight_layout()
+    plt.savefig(output_file)
 
-# Group by timestep
-grouped = df.groupby("timestep").agg({
-    "rip_strength": "first",  # same for all rows in timestep
-    "is_black_hole": "sum"    # count of black holes
-}).reset_index()
-
-# Plot
-plt.figure(figsize=(10, 6))
-plt.plot(grouped["rip_strength"], grouped["is_black_hole"], marker="o")
-plt.xlabel("Rip Strength")
-plt.ylabel("Number of Black Holes")
-plt.title("Black Holes vs. Rip Strength")
-plt.grid(True)
-plt.tight_layout()
-plt.savefig("../assets/black_holes_vs_rip_strength.png")
+if __name__ == "__main__":
+    plot_bh_vs_rs(timestep_summary(open_cache("../data/inflation.csv.gz")))
@@ -1,29 +1,33 @@
-import pandas as pd
 import matplotlib.pyplot as plt
-import gzip
+from inflation_cache import open_cache
 
-# Load the structure (inflation.rs) dataset
-with gzip.open("../data/inflation.csv.gz", "rt") as f:
-    df = pd.read_csv(f)
+def plot_slice(cache, output_file="../assets/curvature_multi_slice.png", summary=None):
+    # Load the structure (inflation.rs) dataset, only the columns we plot
+    df = cache.frame(["row", "col", "layer", "curvature"])
 
-# Determine layer bounds
-min_layer = df['layer'].min()
-mid_layer = df['layer'].max() // 2
-max_layer = df['layer'].max()
+    # Determine layer bounds
+    min_layer = int(cache.min('layer'))
+    mid_layer = int(cache.max('layer')) // 2
+    max_layer = int(cache.max('layer'))
 
-layers_to_plot = [min_layer, mid_layer, max_layer]
+    layers_to_plot = [min_layer, mid_layer, max_layer]
+    # same global maximum either way; the summary just saves a lookup when it is already loaded
+    curvature_max = cache.max('curvature') if summary is None else summary["curvature_max"].max()
 
-fig, axes = plt.subplots(1, 3, figsize=(18, 6))
+    fig, axes = plt.subplots(1, 3, figsize=(18, 6))
 
-for i, layer in enumerate(layers_to_plot):
-    slice_df = df[df['layer'] == layer]
-    curv_matrix = slice_df.groupby(['row', 'col'])['curvature'].mean().unstack()
+    for i, layer in enumerate(layers_to_plot):
+        slice_df = df[df['layer'] == layer]
+        curv_matrix = slice_df.groupby(['row', 'col'])['curvature'].mean().unstack()
 
-    im = axes[i].imshow(curv_matrix, cmap='plasma', origin='lower', vmin=0, vmax=df['curvature'].max())
-    axes[i].set_title(f"Layer {layer}")
-    axes[i].set_xlabel("col")
-    axes[i].set_ylabel("row")
+        im = axes[i].imshow(curv_matrix, cmap='plasma', origin='lower', vmin=0, vmax=curvature_max)
+        axes[i].set_title(f"Layer {layer}")
+        axes[i].set_xlabel("col")
+        axes[i].set_ylabel("row")
 
-fig.colorbar(im, ax=axes.ravel().tolist(), label="Curvature")
-plt.suptitle("Curvature Slices at Layers 0, Mid, Max")
-plt.savefig("../assets/curvature_multi_slice.png", dpi=300)
+    fig.colorbar(im, ax=axes.ravel().tolist(), label="Curvature")
+    plt.suptitle("Curvature Slices at Layers 0, Mid, Max")
+    plt.savefig(output_file, dpi=300)
+
+if __name__ == "__main__":
+    plot_slice(open_cache("../data/inflation.csv.gz"))
@@ -0,0 +1,93 @@
+"""Per-timestep aggregates of the inflation output, computed once and kept as a small CSV.
+
+build_summary() makes one pass over the column cache, a timestep at a time,
+and collects for every timestep the rip strength, the number of black holes,
+how many cells became a black hole since the previous timestep, and the
+min/max/mean/percentiles of curvature, matter density (raw and smoothed) and
+gravity well. timestep_summary() keeps the result in
+../data/inflation_summary.csv, with a .json sidecar recording SUMMARY_VERSION,
+the fields and percentiles and the cached source it came from, and rebuilds
+it whenever any of those differ. Plots and global normalisations read this
+table instead of the full grid.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from inflation_cache import open_cache
+
+SUMMARY_PATH = "../data/inflation_summary.csv"
+FIELDS = ("curvature", "matter_density", "matter_density_smoothed", "gravity_well")
+PERCENTILES = (5, 25, 50, 75, 95)
+# bump when build_summary() changes what it computes
+SUMMARY_VERSION = 1
+
+
+def build_summary(cache, fields=FIELDS, percentiles=PERCENTILES):
+    """DataFrame with one row of aggregates per timestep of cache."""
+    fields = [name for name in fields if name in cache.columns]
+    shape = cache.grid_shape
+    col, row, layer = cache.column("col"), cache.column("row"), cache.column("layer")
+    black_hole = cache.column("is_black_hole")
+    rip = cache.column("rip_strength")
+
+    was_black_hole = np.zeros(int(np.prod(shape)), dtype=bool)
+    records = []
+    for t in cache.timesteps:
+        rows = cache.row_range(t)
+        record = {"timestep": int(t), "rip_strength": float(rip[rows.start]) if rows.stop > rows.start else np.nan}
+
+        index = np.ravel_multi_index((col[rows], row[rows], layer[rows]), shape)
+        is_black_hole = np.asarray(black_hole[rows]).astype(bool)
+        record["black_holes"] = int(is_black_hole.sum())
+        record["new_black_holes"] = int((is_black_hole & ~was_black_hole[index]).sum())
+        was_black_hole[index] = is_black_hole
+
+        for name in fields:
+            values = np.asarray(cache.column(name)[rows], dtype=np.float64)
+            if not len(values):
+                continue
+            record[f"{name}_min"] = values.min()
+            record[f"{name}_max"] = values.max()
+            record[f"{name}_mean"] = values.mean()
+            for q, value in zip(percentiles, np.percentile(values, percentiles)):
+                record[f"{name}_p{q:g}"] = value
+        records.append(record)
+    return pd.DataFrame.from_records(records)
+
+
+def summary_config(cache, fields=FIELDS, percentiles=PERCENTILES):
+    """Everything a summary table depends on, in the JSON form stored next to it."""
+    return dict(version=SUMMARY_VERSION, fields=list(fields), percentiles=list(percentiles),
+                source_size=cache.meta["source_size"], source_mtime_ns=cache.meta["source_mtime_ns"],
+                rows=cache.rows)
+
+
+def _read_config(summary_path):
+    try:
+        with open(str(summary_path) + ".json") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def timestep_summary(cache, summary_path=SUMMARY_PATH, rebuild=False):
+    """The summary of cache, read from summary_path or (re)built there if missing, stale or rebuild is set."""
+    config = summary_config(cache)
+    if not rebuild and os.path.exists(summary_path) and _read_config(summary_path) == config:
+        return pd.read_csv(summary_path)
+
+    summary = build_summary(cache)
+    os.makedirs(os.path.dirname(summary_path) or ".", exist_ok=True)
+    summary.to_csv(summary_path, index=False)
+    # sidecar last: it marks the table as complete
+    with open(str(summary_path) + ".json", "w") as f:
+        json.dump(config, f, indent=2)
+    print(f"Saved {len(summary)} timestep summaries to {summary_path}")
+    return summary
+
+
+if __name__ == "__main__":
+    # the pipeline only runs this when the data or this module changed: always rebuild
+    timestep_summary(open_cache("../data/inflation.csv.gz"), rebuild=True)
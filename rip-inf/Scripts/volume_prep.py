@@ -0,0 +1,49 @@
+"""Regular, downsampled volumes of one timestep for 3D plotly plots.
+
+prepare_volume() reads a column of a single timestep as a dense volume (see
+cell_volume.read_volume) and pools it block by block (mean or max) down to
+about `target` cells per axis. The result is a regular grid of block
+centres in cell coordinates, flattened the way go.Volume expects, so the
+plot size depends only on `target` and not on the simulation grid.
+black_hole_points() lists the black-hole cells straight from the bool volume.
+"""
+import numpy as np
+from cell_volume import read_volume
+
+TARGET_RESOLUTION = 32
+REDUCERS = {"mean": np.nanmean, "max": np.nanmax}
+
+
+def pool_blocks(volume, target=TARGET_RESOLUTION, reduce="mean"):
+    """Pool a 3D array over blocks of ceil(n / target) cells per axis; returns (pooled, block sizes)."""
+    volume = np.asarray(volume, dtype=np.float64)
+    blocks = tuple(max(1, -(-n // target)) for n in volume.shape)
+    pooled_shape = tuple(-(-n // b) for n, b in zip(volume.shape, blocks))
+
+    # pad with NaN to whole blocks so edge blocks only average/max their real cells
+    padded = np.full(tuple(p * b for p, b in zip(pooled_shape, blocks)), np.nan)
+    padded[tuple(slice(0, n) for n in volume.shape)] = volume
+    split = padded.reshape(pooled_shape[0], blocks[0], pooled_shape[1], blocks[1], pooled_shape[2], blocks[2])
+    return REDUCERS[reduce](split, axis=(1, 3, 5)), blocks
+
+
+def block_centers(n, block):
+    """Centre (in cell coordinates) of each block of `block` cells along an axis of n cells."""
+    starts = np.arange(0, n, block)
+    return starts + (np.minimum(starts + block, n) - 1 - starts) / 2
+
+
+def prepare_volume(cache, column="curvature", timestep=None, target=TARGET_RESOLUTION, reduce="mean"):
+    """Flattened (x, y, z, value) regular grid of column at timestep (default: the last), pooled to ~target³."""
+    timestep = cache.timesteps[-1] if timestep is None else timestep
+    volume = read_volume(cache, column, timestep)[0]
+    pooled, blocks = pool_blocks(volume, target, reduce)
+    axes = [block_centers(n, b) for n, b in zip(volume.shape, blocks)]
+    x, y, z = np.meshgrid(*axes, indexing="ij")
+    return x.ravel(), y.ravel(), z.ravel(), pooled.ravel()
+
+
+def black_hole_points(cache, timestep=None):
+    """(col, row, layer) index arrays of the black-hole cells at timestep (default: the last)."""
+    timestep = cache.timesteps[-1] if timestep is None else timestep
+    return np.nonzero(read_volume(cache, "is_black_hole", timestep)[0])
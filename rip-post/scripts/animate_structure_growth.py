@@ -1,10 +1,14 @@
-
-import pandas as pd
+import os
+import sys
 import matplotlib.pyplot as plt
-import matplotlib.animation as animation
 import numpy as np
 from matplotlib.collections import LineCollection
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../rip-inf/Scripts"))
+from cell_stream import read_cells
+from filament_age import EdgeAgeStore
+from parallel_render import render_animation
+
 # --- config ---
 csv_path = '../data/structure.csv.gz'
 output_video = '../assets/structure_growth_preview.mp4'
@@ -12,65 +16,58 @@ layer_to_plot = 5
 timesteps_to_use = 100
 density_threshold = 0.01
 
-# --- load data ---
-print("Loading structure data...")
-df = pd.read_csv(csv_path)
-
-cols = df['col'].max() + 1
-rows = df['row'].max() + 1
-max_timestep = df['timestep'].max()
+def load_state():
+    """Filament age store for every frame of the plotted layer."""
+    # --- load data (only the plotted layer and timesteps) ---
+    print("Loading structure data...")
+    df = read_cells(
+        csv_path,
+        columns=['timestep', 'col', 'row', 'matter_density_smoothed'],
+        timesteps=range(timesteps_to_use),
+        layers=[layer_to_plot],
+        ordered=True
+    )
 
-plt.style.use('dark_background')
-fig, ax = plt.subplots()
-ax.set_facecolor('black')
+    cols = df['col'].max() + 1
+    rows = df['row'].max() + 1
+    n_frames = df['timestep'].max() + 1
 
-all_lines = {}
+    # persistent line storage with age tracking
+    edge_ages = EdgeAgeStore(rows, cols)
+    for t, slice_df in df.groupby('timestep'):
+        grid = np.zeros((rows, cols), dtype=bool)
+        grid[slice_df['row'], slice_df['col']] = slice_df['matter_density_smoothed'] >= density_threshold
+        edge_ages.update(grid, t)
+    return edge_ages, n_frames
 
-def update(frame):
-    t = frame
-    slice_df = df[(df['timestep'] == t) & (df['layer'] == layer_to_plot)]
-    grid = np.zeros((rows, cols))
+def setup(edge_ages):
+    _, rows, cols = edge_ages.first_seen.shape
 
-    for _, row in slice_df.iterrows():
-        val = row['matter_density_smoothed']
-        if val >= density_threshold:
-            grid[int(row['row']), int(row['col'])] = 1
-
-    for r in range(rows):
-        for c in range(cols):
-            if grid[r, c] == 1:
-                for dr in [-1, 0, 1]:
-                    for dc in [-1, 0, 1]:
-                        if dr == 0 and dc == 0:
-                            continue
-                        nr, nc = r + dr, c + dc
-                        if 0 <= nr < rows and 0 <= nc < cols and grid[nr, nc] == 1:
-                            line = tuple(sorted([(c, r), (nc, nr)]))
-                            if line not in all_lines:
-                                all_lines[line] = t
-
-    ax.clear()
+    plt.style.use('dark_background')
+    fig, ax = plt.subplots()
     ax.set_xlim(0, cols)
     ax.set_ylim(0, rows)
     ax.set_facecolor('black')
-    ax.set_title(f"Timestep {t}")
+    title = ax.set_title("")
+
+    glow = ax.add_collection(LineCollection([], linewidths=2.5, alpha=0.3))
+    crisp = ax.add_collection(LineCollection([], colors='white', linewidths=0.4, alpha=1.0))
 
-    if all_lines:
-        lines = list(all_lines.keys())
-        ages = np.array([t - ts for ts in all_lines.values()])
-        norm = plt.Normalize(0, timesteps_to_use)
-        glow_colors = plt.cm.winter(1 - norm(ages) ** 0.7)
+    return fig, dict(edge_ages=edge_ages, title=title, glow=glow, crisp=crisp)
 
-        glow = LineCollection(lines, colors=glow_colors, linewidths=2.5, alpha=0.3)
-        crisp = LineCollection(lines, colors='white', linewidths=0.4, alpha=1.0)
+def update(ctx, t):
+    ctx['title'].set_text(f"Timestep {t}")
 
-        ax.add_collection(glow)
-        ax.add_collection(crisp)
+    lines, ages = ctx['edge_ages'].edges(t)
+    norm = plt.Normalize(0, timesteps_to_use)
+    ctx['glow'].set_segments(lines)
+    ctx['glow'].set_color(plt.cm.winter(1 - norm(ages) ** 0.7))
+    ctx['crisp'].set_segments(lines)
 
-    return []
+if __name__ == "__main__":
+    edge_ages, n_frames = load_state()
 
-print("Rendering animation...")
-writer = animation.FFMpegWriter(fps=5, metadata=dict(artist='RipPost'), bitrate=1800)
-ani = animation.FuncAnimation(fig, update, frames=range(0, min(max_timestep + 1, timesteps_to_use)), blit=True)
-ani.save(output_video, writer=writer)
-print(f"Saved animation: {output_video}")
+    print("Rendering animation...")
+    render_animation(setup, update, range(n_frames), output_video, fps=5,
+                     setup_args=(edge_ages,), metadata=dict(artist='RipPost'), bitrate=1800)
+    print(f"Saved animation: {output_video}")
@@ -1,18 +1,26 @@
-import pandas as pd
+import os
+import sys
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 
-# Load data
-print("Loading data...")
-df = pd.read_csv('../data/post.csv.gz')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../rip-inf/Scripts"))
+from cell_stream import read_cells
 
 # Filter to a specific timestep (e.g., first one)
 timestep = 0
-df_t0 = df[df['timestep'] == timestep]
 
 # Filter by density threshold to reveal filament structure
 density_threshold = 0.001
-df_dense = df_t0[df_t0['matter_density_smoothed'] >= density_threshold]
+
+# Stream the data, keeping only dense cells of the chosen timestep
+print("Loading data...")
+df_dense = read_cells(
+    '../data/post.csv.gz',
+    columns=['col', 'row', 'layer', 'matter_density_smoothed'],
+    timesteps=[timestep],
+    min_density=density_threshold,
+    ordered=True
+)
 
 # Prepare 3D plot
 fig = plt.figure(figsize=(12, 10))
@@ -6,6 +6,9 @@ import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 import glob, os, subprocess
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'rip-inf', 'Scripts'))
+from growing_lines import GrowingLines
+
 # ———————————————
 # CONFIGURATION
 # ———————————————
@@ -65,6 +68,10 @@ ax.set_ylabel("Scale Factor")
 ax.set_title("Combined Scale Factor Evolution")
 
 line, = ax.plot([], [], lw=3)
+# both phases as preallocated arrays; the dark-energy line starts at the end of inflation
+inf_line = GrowingLines([line], T_inf, A_inf, sort=False)
+de_line  = GrowingLines([line], np.concatenate([T_inf[-1:], T_de]),
+                        np.concatenate([A_inf[-1:], A_de]), sort=False)
 txt  = ax.text(0.05, 0.95, "", transform=ax.transAxes,
                fontsize=14, va='top',
                bbox=dict(facecolor='white', alpha=0.8, boxstyle='round'))
@@ -81,23 +88,20 @@ def init():
 def animate(frame):
     if frame < n_inf_frames:
         i = idx_inf[frame]
-        x, y = T_inf[:i+1], A_inf[:i+1]
-        line.set_data(x, y)
+        inf_line.show(i+1)
         line.set_color('gray')
         txt.set_text("Inflation Phase")
         txt.set_alpha(1.0)
     else:
         j = frame - n_inf_frames
         k = idx_de[j]
-        x = np.concatenate([T_inf[-1:], T_de[:k+1]])
-        y = np.concatenate([A_inf[-1:], A_de[:k+1]])
         if frame == n_inf_frames:
             ax.set_yscale('linear')
             ax.set_ylim(A_de.min()*0.9, A_de.max()*1.1)
         frac = j / (n_de_frames-1)
-        line.set_data(x, y)
+        de_line.show(k+2)
         line.set_color(blend_color(frac))
-        txt.set_text(phase_label(x[-1]))
+        txt.set_text(phase_label(T_de[k]))
         txt.set_alpha(1.0)
     return line, txt
 
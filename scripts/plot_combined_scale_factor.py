@@ -45,6 +45,7 @@ plt.legend()
 
 # Save plots
 output_file = "../assets/combined_scale_factor_plot.png"
+plt.savefig(output_file, dpi=300)
 
 if shutil.which('optipng.exe'):
 	try:
@@ -1,40 +1,301 @@
+"""Pipeline runner for every plot/animation script in the project.
+
+Each target declares the script it runs, the inputs it reads and the outputs
+it writes (paths relative to the project root, globs allowed). A target is
+skipped when its outputs exist and the content hash of its inputs, its
+script and the local modules that script imports is unchanged since the last
+successful run. Targets whose inputs are another target's outputs run after
+it; independent targets run concurrently.
+
+	py run_all_scripts.py                  # run everything that is out of date
+	py run_all_scripts.py --force          # rerun everything
+	py run_all_scripts.py rip_de_plots     # one target (and whatever it depends on)
+"""
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import argparse
+import ast
+import fnmatch
+import hashlib
+import json
+import os
 import subprocess
 import sys
-import os
+import time
 
 # project root is two levels up from this file (…/Rip)
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STATE_FILE = PROJECT_ROOT / ".pipeline_state.json"
 
-def run_all_scripts_in_folder(relative_folder: Path):
-	"""Run all .py scripts in a given folder alphabetically."""
-	# resolve scripts/ under the project root
-	scripts_dir = (PROJECT_ROOT / relative_folder).resolve()
-	script_files = sorted(scripts_dir.glob("*.py"))
+# targets run at once by default; each gets an equal share of the cores for its own
+# process pools through WORKERS_ENV (honoured by parallel_render, bootstrap_fit, hz_mcmc)
+DEFAULT_JOBS = 2
+WORKERS_ENV = "RIP_WORKERS"
 
-	# remember current cwd, then cd into the scripts folder
-	cwd = Path.cwd()
-	os.chdir(scripts_dir)
+# directories (besides the script's own) that scripts import shared modules from
+MODULE_DIRS = [PROJECT_ROOT / "rip-inf" / "Scripts"]
 
-	for script_path in script_files:
-		if "run_all" in script_path.name.lower() or "utility" in script_path.name.lower() or "_test" in script_path.name.lower() or "quick" in script_path.name.lower():
-			continue
+INFLATION = ["rip-inf/data/inflation.csv.gz.cache/meta.json"]
+SUMMARY = ["rip-inf/data/inflation_summary.csv", "rip-inf/data/inflation_summary.csv.json"]
+DE_RUNS = ["rip-de/data/run_*.csv"]
+
+TARGETS = {
+	# --- rip-de (every plot from one load of the runs) ---
+	"rip_de_plots": dict(script="rip-de/scripts/plot_all.py", inputs=DE_RUNS,
+		outputs=["rip-de/assets/rip_field_fit.png", "rip-de/assets/rip_fit_params.json",
+			"rip-de/assets/rip_field_overlay.png", "rip-de/assets/rip_field_mean_std.png",
+			"rip-de/data/rip_field_mean_std.csv", "rip-de/assets/rip_field_derivative.png",
+			"rip-de/assets/rip_field_second_derivative.png", "rip-de/assets/rip_field_all_normalized.png",
+			"rip-de/assets/rip_field_summary_animation.gif", "rip-de/assets/rip_field_vs_hz.png"]),
+
+	# --- rip-inf ---
+	"inflation_cache": dict(script="rip-inf/Scripts/inflation_cache.py", inputs=["rip-inf/data/inflation.csv.gz"],
+		outputs=INFLATION),
+	"inflation_summary": dict(script="rip-inf/Scripts/timestep_summary.py", inputs=INFLATION, outputs=SUMMARY),
+	"inflation_plots": dict(script="rip-inf/Scripts/plot_all.py", inputs=INFLATION + SUMMARY,
+		outputs=["rip-inf/assets/curvature_multi_slice.png", "rip-inf/assets/black_holes_vs_rip_strength.png",
+			"rip-inf/assets/curvature_3d_plot.html", "rip-inf/assets/curvature_3d_plot.7z",
+			"rip-inf/data/filament_components.csv"]),
+	"cosmic_filaments": dict(script="rip-inf/Scripts/animate_cosmic_filaments.py", inputs=INFLATION,
+		outputs=["rip-inf/assets/cosmic_filaments.gif"]),
+	"filament_growth": dict(script="rip-inf/Scripts/animate_cosmic_filaments_growth.py", inputs=INFLATION,
+		outputs=["rip-inf/assets/filament_growth.gif"]),
+	"filament_growth_crystal": dict(script="rip-inf/Scripts/animate_cosmic_filaments_growth_crystal.py", inputs=INFLATION,
+		outputs=["rip-inf/assets/filament_growth_crystal.mp4"]),
+	"filament_growth_hm": dict(script="rip-inf/Scripts/animate_cosmic_filaments_growth_hm.py", inputs=INFLATION,
+		outputs=["rip-inf/assets/filament_growth_hm.gif"]),
+	"filament_growth_progressive": dict(script="rip-inf/Scripts/animate_cosmic_filaments_growth_progressive.py", inputs=INFLATION,
+		outputs=["rip-inf/assets/filament_growth_progressive.gif"]),
+	"dimple_3d": dict(script="rip-inf/Scripts/animate_dimple_3d.py", inputs=INFLATION,
+		outputs=["rip-inf/assets/dimple_3d_animation.gif"]),
+	"dimple_evolution": dict(script="rip-inf/Scripts/animate_dimple_evolution.py", inputs=INFLATION,
+		outputs=["rip-inf/assets/curvature_animation.gif"]),
+	"inflation_animation": dict(script="rip-inf/Scripts/animate_inflation.py", inputs=["rip-inf/data/simulation.csv*"],
+		outputs=["rip-inf/assets/inflation_animation.gif"]),
+	"inflation_plot": dict(script="rip-inf/Scripts/plot_simulation.py", inputs=["rip-inf/data/simulation.csv*"],
+		outputs=["rip-inf/assets/scale_factor_rip_plot_inflation_end.png", "rip-inf/data/simulation.csv"]),
+	"decompress_structure": dict(script="rip-inf/Scripts/decompress_simulation.py", inputs=["rip-inf/data/structure.csv.gz"],
+		outputs=["rip-inf/data/structure.csv"]),
+	"structure_plot": dict(script="rip-inf/Scripts/plot_structure..py", inputs=["rip-inf/data/structure.csv"],
+		outputs=["rip-inf/assets/scale_factor_rip_plot_inflation_end.png"]),
+	"particles_3d": dict(script="rip-inf/Scripts/plot_particles_3d.py", inputs=["rip-inf/data/structure.csv"],
+		outputs=["rip-inf/assets/particle_animation.gif"]),
+	"crystal_growth": dict(script="rip-inf/Scripts/simulate_crystal_growth_final_gravityfade.py",
+		inputs=["rip-inf/assets/background_music_crystal_growth.mp3"],
+		outputs=["rip-inf/assets/synthetic_crystal_growth_final_gravityfade.mp4",
+			"rip-inf/assets/synthetic_crystal_growth_final_gravityfade_with_music.mp4"]),
+
+	# --- rip-post ---
+	"post_filaments_3d": dict(script="rip-post/scripts/plot_post_filaments_3d.py", inputs=["rip-post/data/post.csv.gz"],
+		outputs=["rip-post/assets/post_filament_3d_t0.png"]),
+	"structure_growth": dict(script="rip-post/scripts/animate_structure_growth.py", inputs=["rip-post/data/structure.csv.gz"],
+		outputs=["rip-post/assets/structure_growth_preview.mp4"]),
+
+	# --- combined ---
+	"combined_animation": dict(script="scripts/create_combined_animation.py",
+		inputs=["rip-inf/data/simulation.csv"] + DE_RUNS,
+		outputs=["assets/combined_scale_factor_animation.gif"]),
+	"combined_plot": dict(script="scripts/plot_combined_scale_factor.py",
+		inputs=["rip-inf/data/simulation.csv"] + DE_RUNS,
+		outputs=["assets/combined_scale_factor_plot.png"]),
+}
 
-		print(f"Running: {script_path}")
-		result = subprocess.run(["py", str(script_path)], capture_output=True, text=True)
-		if result.returncode == 0:
-			print(result.stdout)
+
+def expand(patterns):
+	"""Existing files matching the given root-relative patterns, sorted."""
+	files = set()
+	for pattern in patterns:
+		files.update(p for p in PROJECT_ROOT.glob(pattern) if p.is_file())
+	return sorted(files)
+
+
+def local_modules(script: Path, seen=None):
+	"""The script plus every module it (transitively) imports from its own folder or MODULE_DIRS."""
+	seen = set() if seen is None else seen
+	if script in seen:
+		return seen
+	seen.add(script)
+	tree = ast.parse(script.read_text(encoding="utf-8"))
+	for node in ast.walk(tree):
+		if isinstance(node, ast.Import):
+			names = [alias.name for alias in node.names]
+		elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+			names = [node.module]
 		else:
-			print(f"Error in {script_path}:\n{result.stderr}")
+			continue
+		for name in names:
+			for folder in [script.parent] + MODULE_DIRS:
+				candidate = folder / (name.split(".")[0] + ".py")
+				if candidate.is_file():
+					local_modules(candidate, seen)
+					break
+	return seen
+
+
+class Hasher:
+	"""sha256 of file contents, memoized on (size, mtime) across runs."""
+
+	def __init__(self, known):
+		self.known = known
+
+	def file(self, path: Path):
+		key = str(path.relative_to(PROJECT_ROOT))
+		st = path.stat()
+		cached = self.known.get(key)
+		if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+			return cached[2]
+		digest = hashlib.sha256()
+		with open(path, "rb") as f:
+			for block in iter(lambda: f.read(1 << 20), b""):
+				digest.update(block)
+		self.known[key] = [st.st_size, st.st_mtime_ns, digest.hexdigest()]
+		return self.known[key][2]
+
+	def target(self, target):
+		script = PROJECT_ROOT / target["script"]
+		# a target's own outputs (e.g. a csv it unpacks from a matching .gz) are not inputs
+		outputs = set(expand(target["outputs"]))
+		files = sorted(local_modules(script)) + [p for p in expand(target["inputs"]) if p not in outputs]
+		digest = hashlib.sha256()
+		for path in files:
+			digest.update(str(path.relative_to(PROJECT_ROOT)).encode())
+			digest.update(self.file(path).encode())
+		return digest.hexdigest()
+
+
+def dependencies(targets):
+	"""name -> set of targets that must finish first (producers of its inputs, earlier writers of its outputs)."""
+	deps = {name: set() for name in targets}
+	names = list(targets)
+	for name in names:
+		for other in names:
+			if other == name:
+				continue
+			produces = targets[other]["outputs"]
+			if any(fnmatch.fnmatch(out, pattern) for out in produces for pattern in targets[name]["inputs"]):
+				deps[name].add(other)
+			elif names.index(other) < names.index(name) and set(produces) & set(targets[name]["outputs"]):
+				deps[name].add(other)
+	return deps
+
+
+def select(targets, wanted, deps):
+	"""Restrict to the wanted targets plus everything they depend on."""
+	if not wanted:
+		return dict(targets)
+	unknown = [name for name in wanted if name not in targets]
+	if unknown:
+		raise SystemExit(f"Unknown target(s): {', '.join(unknown)}. Use --list to see all targets.")
+	keep = set()
+	stack = list(wanted)
+	while stack:
+		name = stack.pop()
+		if name not in keep:
+			keep.add(name)
+			stack.extend(deps[name])
+	return {name: target for name, target in targets.items() if name in keep}
+
+
+def save_state(state):
+	"""Write the pipeline state atomically (temp file + rename), so an interrupted run never leaves it half-written."""
+	tmp = STATE_FILE.with_name(STATE_FILE.name + ".tmp")
+	tmp.write_text(json.dumps(state, indent=1))
+	os.replace(tmp, STATE_FILE)
+
+
+def run_target(name, target, env=None):
+	"""Run one script from its own folder; returns (returncode, output, seconds)."""
+	script = PROJECT_ROOT / target["script"]
+	start = time.perf_counter()
+	result = subprocess.run([sys.executable, script.name], cwd=script.parent, capture_output=True, text=True, env=env)
+	output = result.stdout if result.returncode == 0 else result.stdout + result.stderr
+	return result.returncode, output, time.perf_counter() - start
+
+
+def run_pipeline(wanted=None, force=False, jobs=None):
+	try:
+		state = json.loads(STATE_FILE.read_text())
+	except (FileNotFoundError, json.JSONDecodeError):
+		state = {}
+	stamps = state.setdefault("targets", {})
+	hasher = Hasher(state.setdefault("files", {}))
+
+	all_deps = dependencies(TARGETS)
+	targets = select(TARGETS, wanted, all_deps)
+	deps = {name: all_deps[name] & set(targets) for name in targets}
+
+	pending = dict(targets)
+	running = {}
+	report = {}
+
+	def start_ready(pool):
+		# targets resolved without running (skipped, up to date) can unblock ones already passed over
+		progress = True
+		while progress:
+			progress = False
+			for name in list(pending):
+				if any(dep not in report for dep in deps[name]):
+					continue
+				progress = True
+				start_target(pool, name)
+
+	def start_target(pool, name):
+		target = pending.pop(name)
+		failed = [dep for dep in deps[name] if report[dep][0] == "failed"]
+		# producers have finished by now, so anything still absent will not appear
+		missing = [p for p in target["inputs"] if not expand([p])]
+		if failed or missing:
+			reason = f"dependency failed: {', '.join(failed)}" if failed else f"missing input: {', '.join(missing)}"
+			report[name] = ("skipped", 0.0, reason)
+			return
+		digest = hasher.target(target)
+		if not force and stamps.get(name) == digest and all((PROJECT_ROOT / out).exists() for out in target["outputs"]):
+			report[name] = ("up to date", 0.0, "")
+			return
+		print(f"Running: {name} ({target['script']})")
+		running[pool.submit(run_target, name, target, env)] = (name, digest)
+
+	workers = jobs or DEFAULT_JOBS
+	env = dict(os.environ)
+	env.setdefault(WORKERS_ENV, str(max(1, (os.cpu_count() or 1) // workers)))
+	with ThreadPoolExecutor(max_workers=workers) as pool:
+		start_ready(pool)
+		while running:
+			done, _ = wait(running, return_when=FIRST_COMPLETED)
+			for future in done:
+				name, digest = running.pop(future)
+				returncode, output, seconds = future.result()
+				if returncode == 0:
+					stamps[name] = digest
+					report[name] = ("ok", seconds, "")
+					print(f"Finished: {name} in {seconds:.1f}s\n{output}")
+				else:
+					stamps.pop(name, None)
+					report[name] = ("failed", seconds, f"exit code {returncode}")
+					print(f"Error in {name}:\n{output}")
+				# after every target, so finished work survives a failure or Ctrl+C
+				save_state(state)
+			start_ready(pool)
+
+	print(f"\n{'target':<30} {'status':<11} {'wall time':>9}")
+	for name in targets:
+		status, seconds, reason = report[name]
+		print(f"{name:<30} {status:<11} {seconds:>8.1f}s  {reason}")
+	return all(status != "failed" for status, _, _ in report.values())
 
-	# restore whatever cwd you started in
-	os.chdir(cwd)
 
 if __name__ == "__main__":
-	# point to the two sub‐folders under the project root
-	run_all_scripts_in_folder(Path("rip-de") / "scripts")
-	run_all_scripts_in_folder(Path("rip-inf") / "scripts")
+	parser = argparse.ArgumentParser(description="Run the plotting pipeline, skipping up-to-date targets.")
+	parser.add_argument("targets", nargs="*", help="targets to build (default: all)")
+	parser.add_argument("--force", action="store_true", help="rerun targets even if their inputs are unchanged")
+	parser.add_argument("-j", "--jobs", type=int, help=f"number of targets to run concurrently (default: {DEFAULT_JOBS}); "
+		f"each gets CPU count / jobs processes unless {WORKERS_ENV} is set")
+	parser.add_argument("--list", action="store_true", help="list targets and exit")
+	args = parser.parse_args()
+
+	if args.list:
+		for name, target in TARGETS.items():
+			print(f"{name:<30} {target['script']}")
+		sys.exit(0)
 
-	# just echo the name of this launcher script
-	print(PROJECT_ROOT)
-	run_all_scripts_in_folder(PROJECT_ROOT / "scripts")
\ No newline at end of file
+	sys.exit(0 if run_pipeline(args.targets, args.force, args.jobs) else 1)